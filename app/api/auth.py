@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
-from passlib.context import CryptContext
-from app.db.database import get_db
+from app.core.security import verify_password
+from app.db.async_database import get_async_db
 from app.models.user import User
 from app.core.config import settings
 
@@ -11,17 +12,35 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 router = APIRouter(tags=["Authentication"])
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+def get_user_by_email(db: Session, email: str):
+    return (
+        db.query(User)
+        .options(selectinload(User.roles))
+        .filter(User.email == email)
+        .first()
+    )
+
+def save_rehashed_password(db: Session, user: User, new_hash: str):
+    user.hashed_password = new_hash
+    db.commit()
+    # reload what login reads, so nothing lazy-loads on the event loop
+    db.refresh(user)
+    db.refresh(user, ["roles"])
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await db.run_sync(get_user_by_email, email)
+    if not user:
+        return None
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+    # bcrypt runs in the password pool, not on the API threadpool
+    is_valid, new_hash = await verify_password(password, user.hashed_password)
+    if not is_valid:
         return None
+
+    if new_hash:
+        await db.run_sync(save_rehashed_password, user, new_hash)
     return user
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
@@ -32,8 +51,8 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 @router.post("/login")
-def login(email: str, password: str, db: Session = Depends(get_db)):
-    user = authenticate_user(db, email, password)
+async def login(email: str, password: str, db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, email, password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     roles = [role.name for role in user.roles]
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
-from app.db.database import get_db
+from app.db.async_database import get_async_read_db
+from app.schemas.invoice_schema import InvoiceResponse
+from app.schemas.page_schema import Page
 from app.api.dependencies import require_roles
+from app.core.cache import dashboard_cache
 from app.services.dashboard_service import get_dashboard_summary,get_daily_revenue_chart,get_monthly_revenue_chart,get_invoice_list
 
 
@@ -10,49 +13,55 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
 @router.get("/summary")
-def dashboard_summary(
-    db: Session = Depends(get_db),
+async def dashboard_summary(
+    db: AsyncSession = Depends(get_async_read_db),
     current_user=Depends(require_roles(["shop_admin", "super_admin"]))
 ):
-    role_names = [role.name for role in current_user.roles]
-
-    if "shop_admin" in role_names:
+    if "shop_admin" in current_user.roles:
         shop_id = current_user.organization_id
     else:
         shop_id = None
 
-    return get_dashboard_summary(db, shop_id)
+    return await dashboard_cache.run_cached(db, get_dashboard_summary, shop_id)
 
 
 
 @router.get("/charts/daily")
-def daily_chart(
+async def daily_chart(
     days: int = 7,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user=Depends(require_roles(["shop_admin", "super_admin"]))
 ):
-    shop_id = current_user.organization_id if "shop_admin" in [r.name for r in current_user.roles] else None
-    return get_daily_revenue_chart(db, shop_id, days)
+    shop_id = current_user.organization_id if "shop_admin" in current_user.roles else None
+    return await dashboard_cache.run_cached(db, get_daily_revenue_chart, shop_id, days)
 
 
 @router.get("/charts/monthly")
-def monthly_chart(
+async def monthly_chart(
     months: int = 6,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user=Depends(require_roles(["shop_admin", "super_admin"]))
 ):
-    shop_id = current_user.organization_id if "shop_admin" in [r.name for r in current_user.roles] else None
-    return get_monthly_revenue_chart(db, shop_id, months)
+    shop_id = current_user.organization_id if "shop_admin" in current_user.roles else None
+    return await dashboard_cache.run_cached(db, get_monthly_revenue_chart, shop_id, months)
 
-@router.get("/invoices")
-def invoice_dashboard_list(
+@router.get("/invoices", response_model=Page[InvoiceResponse])
+async def invoice_dashboard_list(
     status: str | None = None,
     date_from: date | None = None,
     date_to: date | None = None,
-    page: int = 1,
-    limit: int = 10,
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    limit: int = Query(10, ge=1, le=100),
+    with_total: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user=Depends(require_roles(["shop_admin", "super_admin"]))
 ):
-    shop_id = current_user.organization_id if "shop_admin" in [r.name for r in current_user.roles] else None
-    return get_invoice_list(db, shop_id, status, date_from, date_to, page, limit)
\ No newline at end of file
+    shop_id = current_user.organization_id if "shop_admin" in current_user.roles else None
+    return await db.run_sync(get_invoice_list, shop_id, status, date_from, date_to, cursor, limit, with_total)
+
+
+@router.get("/cache/stats")
+def dashboard_cache_stats(
+    current_user=Depends(require_roles(["super_admin"]))
+):
+    return dashboard_cache.stats()
@@ -1,17 +1,60 @@
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.db.async_database import get_async_db
 from app.models.user import User
+from app.core.cache import MemoryCache
 from app.core.config import settings
+from app.core.logging_config import bind_request
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller, resolved once per request."""
+    id: int
+    username: str
+    organization_id: int | None
+    roles: frozenset
+
+
+# user_id -> Principal, so authenticated requests skip the users/roles queries
+principal_cache = MemoryCache(
+    settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+    settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_principal(user_id: int):
+    """Call whenever a user or their roles change."""
+    principal_cache.delete(user_id)
+
+
+def load_principal(db: Session, user_id: int) -> Principal | None:
+    user = (
+        db.query(User)
+        .options(selectinload(User.roles))
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not user:
+        return None
+    return Principal(
+        id=user.id,
+        username=user.username,
+        organization_id=user.organization_id,
+        roles=frozenset(role.name for role in user.roles)
+    )
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Principal:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: int = payload.get("user_id")
@@ -20,15 +63,19 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = await db.run_sync(load_principal, user_id)
+        if not principal:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal_cache.set(user_id, principal)
+
+    bind_request(user_id=principal.id, shop_id=principal.organization_id)
+    return principal
 
 def require_roles(required_roles: list):
-    def role_checker(current_user: User = Depends(get_current_user)):
-        user_roles = [role.name for role in current_user.roles]
-        if not any(r in user_roles for r in required_roles):
+    def role_checker(current_user: Principal = Depends(get_current_user)):
+        if current_user.roles.isdisjoint(required_roles):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return current_user
     return role_checker
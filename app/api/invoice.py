@@ -1,55 +1,195 @@
-from fastapi import APIRouter, Depends
+import json
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from datetime import date
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from app.core.config import settings
 from app.db.database import get_db
-from app.schemas.invoice_schema import InvoiceCreate, InvoiceResponse
+from app.db.async_database import get_async_db, get_async_read_db
+from app.schemas.invoice_schema import InvoiceCreate, InvoiceResponse, BulkInvoiceResponse
+from app.schemas.page_schema import Page
 from app.api.dependencies import require_roles
-from app.services.invoice_service import create_invoice_service
+from app.services.invoice_service import create_invoice_service, create_invoices_bulk_service
 from app.models.invoice import Invoice
+from app.services.loading import INVOICE_LIST
+from app.services.export_service import (
+    EXPORT_FORMATS, EXPORT_KINDS, archived_export_rows, build_export_query, stream_export
+)
+from app.utils.pagination import keyset_paginate
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     tags=["Invoices"],
     prefix="/invoices"
 )
 
+def _create_invoice(db: Session, invoice_data, current_user):
+    invoice = create_invoice_service(
+        db=db,
+        invoice_data=invoice_data,
+        current_user=current_user
+    )
+    invoice.items  # load for the response while still inside run_sync
+    return invoice
+
+
 @router.post("/", response_model=InvoiceResponse)
-def create_invoice(
+async def create_invoice(
     invoice: InvoiceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(require_roles(["shop_admin", "super_admin"]))
 ):
-    db_invoice = create_invoice_service(
-        db=db,
-        invoice_data=invoice,
-        current_user=current_user
-    )
+    db_invoice = await db.run_sync(_create_invoice, invoice, current_user)
 
-    print(
-        f"🧾 Invoice {db_invoice.invoice_number} "
-        f"created by {current_user.username}"
-    )
+    logger.info("Invoice %s created by %s", db_invoice.invoice_number, current_user.username)
 
     return db_invoice
 
 
-@router.get("/", response_model=List[InvoiceResponse])
-def list_invoices(
+async def _read_bulk_payload(request: Request):
+    """
+    Parse a JSON array or an NDJSON stream (one InvoiceCreate per line).
+    Returns (parsed rows, errors) where both are keyed by row index.
+    More than INVOICE_BULK_MAX_ROWS rows is rejected with 413; an NDJSON
+    stream is cut off as soon as it goes over.
+    """
+    rows, errors = {}, {}
+
+    def check_size(count):
+        if count > settings.INVOICE_BULK_MAX_ROWS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {settings.INVOICE_BULK_MAX_ROWS} invoices per request"
+            )
+
+    def parse(index, raw):
+        try:
+            rows[index] = InvoiceCreate.model_validate(raw)
+        except ValidationError as exc:
+            errors[index] = str(exc)
+
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        index, pending = 0, b""
+        async for chunk in request.stream():
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                check_size(index + 1)
+                try:
+                    parse(index, json.loads(line))
+                except json.JSONDecodeError as exc:
+                    errors[index] = f"Invalid JSON: {exc}"
+                index += 1
+        if pending.strip():
+            check_size(index + 1)
+            try:
+                parse(index, json.loads(pending))
+            except json.JSONDecodeError as exc:
+                errors[index] = f"Invalid JSON: {exc}"
+    else:
+        try:
+            payload = await request.json()
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of invoices")
+        check_size(len(payload))
+        for index, raw in enumerate(payload):
+            parse(index, raw)
+
+    return rows, errors
+
+
+@router.post("/bulk", response_model=BulkInvoiceResponse)
+async def create_invoices_bulk(
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(require_roles(["shop_admin", "super_admin"]))
 ):
-    role_names = [role.name for role in current_user.roles]
-
-    if "shop_admin" in role_names:
-        invoices = (
-            db.query(Invoice)
-            .filter(Invoice.shop_id == current_user.organization_id)
-            .all()
-        )
-    else:
-        invoices = db.query(Invoice).all()
+    rows, errors = await _read_bulk_payload(request)
 
-    print(
-        f"📄 {current_user.username} fetched {len(invoices)} invoices"
+    indexes = sorted(rows)
+    service_results = await run_in_threadpool(
+        create_invoices_bulk_service,
+        db,
+        [rows[index] for index in indexes],
+        current_user
     )
 
-    return invoices
+    results = [
+        {"index": index, "status": "error", "detail": detail}
+        for index, detail in errors.items()
+    ]
+    for index, result in zip(indexes, service_results):
+        results.append(dict(result, index=index))
+    results.sort(key=lambda result: result["index"])
+
+    created = sum(1 for result in results if result["status"] == "created")
+
+    logger.info("%d/%d invoices bulk created by %s", created, len(results), current_user.username)
+
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }
+
+
+def _list_invoices(db: Session, shop_id: int | None, cursor: str | None, limit: int, with_total: bool):
+    query = db.query(Invoice).options(*INVOICE_LIST)
+    if shop_id:
+        query = query.filter(Invoice.shop_id == shop_id)
+    return keyset_paginate(query, Invoice, cursor, limit, with_total)
+
+
+@router.get("/", response_model=Page[InvoiceResponse])
+async def list_invoices(
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    with_total: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(require_roles(["shop_admin", "super_admin"]))
+):
+    shop_id = current_user.organization_id if "shop_admin" in current_user.roles else None
+    page = await db.run_sync(_list_invoices, shop_id, cursor, limit, with_total)
+
+    logger.debug("%s fetched %d invoices", current_user.username, len(page["data"]), extra={"sample": True})
+
+    return page
+
+
+@router.get("/export")
+def export_invoices(
+    kind: str = "invoices",
+    format: str = "csv",
+    shop_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    current_user=Depends(require_roles(["shop_admin", "super_admin"]))
+):
+    if kind not in EXPORT_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(EXPORT_KINDS)}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    if "shop_admin" in current_user.roles:
+        shop_id = current_user.organization_id
+
+    stmt = build_export_query(kind, shop_id, date_from, date_to)
+    archived = archived_export_rows(kind, shop_id, date_from, date_to)
+
+    logger.info("%s exporting %s as %s", current_user.username, kind, format)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_export(stmt, format, archived),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={kind}.{format}"}
+    )
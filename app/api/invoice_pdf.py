@@ -1,34 +1,157 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+import logging
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.models.invoice import Invoice
+from app.db.database import get_db, get_read_db
+from app.models.invoice import Invoice, InvoiceItem
 from app.api.dependencies import require_roles
-from app.services.pdf_service import generate_invoice_pdf
+from app.services.archive_service import load_archived_invoice
+from app.services.pdf_service import generate_invoice_pdf, invoice_items_query, iter_invoice_items
+from app.services.pdf_cache import pdf_cache
+from app.services.loading import INVOICE_PDF_HEADER
+from app.services.pdf_export_service import export_jobs, find_invoice_ids, start_export, stream_invoice_zip
+from app.schemas.invoice_schema import PdfExportRequest
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/invoices", tags=["Invoice PDF"])
 
+def open_file_response(handle, **kwargs) -> FileResponse:
+    """
+    FileResponse for an already open file, closed once it's sent. It's
+    served through /proc/self/fd, which reopens the same file even after
+    the cache has evicted (unlinked) its path.
+    """
+    fd = handle.fileno()
+    return FileResponse(
+        f"/proc/self/fd/{fd}",
+        stat_result=os.fstat(fd),
+        background=BackgroundTask(handle.close),
+        **kwargs
+    )
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates or "*" in candidates
+
+def not_modified_since(request: Request, modified_at: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(request.headers["if-modified-since"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds
+    return modified_at.replace(microsecond=0, tzinfo=timezone.utc) <= since
+
 @router.get("/{invoice_id}/pdf")
 def download_invoice_pdf(
     invoice_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(require_roles(["shop_admin", "super_admin"]))
 ):
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    invoice = db.query(Invoice).options(*INVOICE_PDF_HEADER).filter(Invoice.id == invoice_id).first()
+    archived = invoice is None
+    if archived:
+        # Moved to cold storage: render from its archived record
+        invoice = load_archived_invoice(db, invoice_id)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
 
     # Shop RBAC
-    if "shop_admin" in [r.name for r in current_user.roles]:
+    if "shop_admin" in current_user.roles:
         if invoice.shop_id != current_user.organization_id:
             raise HTTPException(status_code=403, detail="Access denied")
 
-    pdf_buffer = generate_invoice_pdf(invoice)
+    # Versioned by updated_at, so revalidating reads no items
+    version = pdf_cache.version(invoice)
+    modified_at = invoice.updated_at or invoice.created_at
+    headers = {
+        "ETag": f'"{invoice.id}-{version}"',
+        "Last-Modified": format_datetime(modified_at.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": "private, no-cache"
+    }
 
-    print(f"📄 Invoice PDF generated for invoice {invoice.invoice_number}")
+    # If-None-Match wins over If-Modified-Since when both are sent
+    if "if-none-match" in request.headers:
+        if etag_matches(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    elif not_modified_since(request, modified_at):
+        return Response(status_code=304, headers=headers)
 
-    return StreamingResponse(
-        pdf_buffer,
+    def render(inv):
+        if archived:
+            return generate_invoice_pdf(inv, inv.items, len(inv.items))
+        item_count = invoice_items_query(db, inv).with_entities(func.count(InvoiceItem.id)).scalar()
+        return generate_invoice_pdf(inv, iter_invoice_items(db, inv), item_count)
+
+    pdf_file = pdf_cache.open_or_render(invoice, version, render)
+
+    logger.debug("Invoice PDF served for invoice %s", invoice.invoice_number, extra={"sample": True})
+
+    # Served from the open handle: the cached file may be evicted meanwhile
+    return open_file_response(
+        pdf_file,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={invoice.invoice_number}.pdf"}
+        filename=f"{invoice.invoice_number}.pdf",
+        headers=headers
     )
+
+
+@router.post("/export/pdf")
+def export_invoice_pdfs(
+    export: PdfExportRequest,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(require_roles(["shop_admin", "super_admin"]))
+):
+    if not (export.invoice_ids or export.date_from or export.date_to or export.shop_id):
+        raise HTTPException(status_code=400, detail="Specify a date range, a shop or invoice_ids")
+
+    shop_id = current_user.organization_id if "shop_admin" in current_user.roles else export.shop_id
+
+    invoice_ids = find_invoice_ids(db, shop_id, export.date_from, export.date_to, export.invoice_ids)
+    if not invoice_ids:
+        raise HTTPException(status_code=404, detail="No invoices match the export")
+
+    export_id = start_export(invoice_ids, shop_id, current_user.id)
+
+    logger.info("PDF export %s started for %d invoices by %s", export_id, len(invoice_ids), current_user.username)
+
+    return StreamingResponse(
+        stream_invoice_zip(export_id, invoice_ids),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=invoices-{export_id}.zip",
+            "X-Export-Id": export_id
+        }
+    )
+
+
+@router.get("/export/pdf/{export_id}")
+def export_status(
+    export_id: str,
+    current_user=Depends(require_roles(["shop_admin", "super_admin"]))
+):
+    """
+    Progress of a PDF export. Jobs are tracked in the memory of the
+    worker process streaming them, so this only finds exports started
+    on the same worker (run a single worker, or route by X-Export-Id);
+    finished jobs are kept for an hour.
+    """
+    job = export_jobs.get(export_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    # Shop admins only see their own shop's exports (others' look missing)
+    if "super_admin" not in current_user.roles and job["shop_id"] != current_user.organization_id:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
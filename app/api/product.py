@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db, get_read_db
+from app.db.async_database import get_async_read_db
 from app.models.product import Product
 from app.schemas.product_schema import ProductCreate, ProductUpdate, ProductResponse
+from app.schemas.page_schema import Page
 from app.api.dependencies import require_roles, get_current_user
+from app.services.invoice_service import touch_invoices_with_product
+from app.services.product_search_service import search_products
+from app.utils.pagination import keyset_paginate
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Products"], prefix="/products")
 
@@ -12,25 +20,46 @@ router = APIRouter(tags=["Products"], prefix="/products")
 @router.post("/", response_model=ProductResponse)
 def create_product(product: ProductCreate, db: Session = Depends(get_db),
                    current_user=Depends(require_roles(["shop_admin", "super_admin"]))):
-    shop_id = current_user.organization_id if "shop_admin" in [role.name for role in current_user.roles] else None
-    if shop_id is None and "super_admin" in [role.name for role in current_user.roles]:
+    shop_id = current_user.organization_id if "shop_admin" in current_user.roles else None
+    if shop_id is None and "super_admin" in current_user.roles:
         raise HTTPException(status_code=400, detail="Super Admin must specify shop_id when creating product")
     
     db_product = Product(**product.dict(), shop_id=shop_id)
     db.add(db_product)
     db.commit()
     db.refresh(db_product)
-    print(f"🛠 Product '{db_product.name}' created by '{current_user.username}' for shop_id {db_product.shop_id}")
+    logger.info("Product '%s' created by '%s' for shop_id %s", db_product.name, current_user.username, db_product.shop_id)
     return db_product
 
 # List Products
-@router.get("/", response_model=List[ProductResponse])
-def list_products(db: Session = Depends(get_db), current_user=Depends(require_roles(["shop_admin", "super_admin"]))):
-    if "shop_admin" in [role.name for role in current_user.roles]:
-        products = db.query(Product).filter(Product.shop_id == current_user.organization_id).all()
-    else:
-        products = db.query(Product).all()
-    print(f"📦 '{current_user.username}' fetched {len(products)} products")
+def _list_products(db: Session, shop_id: int | None, cursor: str | None, limit: int, with_total: bool):
+    query = db.query(Product)
+    if shop_id:
+        query = query.filter(Product.shop_id == shop_id)
+    return keyset_paginate(query, Product, cursor, limit, with_total)
+
+@router.get("/", response_model=Page[ProductResponse])
+async def list_products(cursor: str | None = None, limit: int = Query(20, ge=1, le=100), with_total: bool = False,
+                        db: AsyncSession = Depends(get_async_read_db), current_user=Depends(require_roles(["shop_admin", "super_admin"]))):
+    shop_id = current_user.organization_id if "shop_admin" in current_user.roles else None
+    page = await db.run_sync(_list_products, shop_id, cursor, limit, with_total)
+    logger.debug("'%s' fetched %d products", current_user.username, len(page["data"]), extra={"sample": True})
+    return page
+
+# Search Products (checkout type-ahead)
+# Sync on purpose: psycopg2 inlines the LIKE prefix, which the planner
+# needs to use the prefix index (a server-side bind parameter hides it)
+@router.get("/search", response_model=list[ProductResponse])
+def search(q: str = Query(..., min_length=1, max_length=100), limit: int = Query(10, ge=1, le=50),
+           active_only: bool = True, in_stock: bool = False, shop_id: int | None = None,
+           db: Session = Depends(get_read_db), current_user=Depends(require_roles(["shop_admin", "super_admin"]))):
+    if "shop_admin" in current_user.roles:
+        shop_id = current_user.organization_id
+    elif shop_id is None:
+        raise HTTPException(status_code=400, detail="Super Admin must specify shop_id to search products")
+
+    products = search_products(db, shop_id, q, limit, active_only, in_stock)
+    logger.debug("'%s' searched products for %r: %d hits", current_user.username, q, len(products), extra={"sample": True})
     return products
 
 # Update Product
@@ -41,15 +70,20 @@ def update_product(product_id: int, product: ProductUpdate, db: Session = Depend
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    if "shop_admin" in [role.name for role in current_user.roles] and db_product.shop_id != current_user.organization_id:
+    if "shop_admin" in current_user.roles and db_product.shop_id != current_user.organization_id:
         raise HTTPException(status_code=403, detail="Not allowed to modify products of another shop")
     
-    for field, value in product.dict(exclude_unset=True).items():
+    changes = product.dict(exclude_unset=True)
+    if "name" in changes and changes["name"] != db_product.name:
+        # invoice PDFs print the product name
+        touch_invoices_with_product(db, product_id)
+
+    for field, value in changes.items():
         setattr(db_product, field, value)
     
     db.commit()
     db.refresh(db_product)
-    print(f"🔧 Product '{db_product.name}' updated by '{current_user.username}'")
+    logger.info("Product '%s' updated by '%s'", db_product.name, current_user.username)
     return db_product
 
 # Delete Product
@@ -60,10 +94,10 @@ def delete_product(product_id: int, db: Session = Depends(get_db),
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    if "shop_admin" in [role.name for role in current_user.roles] and db_product.shop_id != current_user.organization_id:
+    if "shop_admin" in current_user.roles and db_product.shop_id != current_user.organization_id:
         raise HTTPException(status_code=403, detail="Not allowed to delete products of another shop")
     
     db.delete(db_product)
     db.commit()
-    print(f"🗑 Product '{db_product.name}' deleted by '{current_user.username}'")
+    logger.info("Product '%s' deleted by '%s'", db_product.name, current_user.username)
     return {"message": "Product deleted successfully"}
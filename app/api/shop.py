@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends
+import logging
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.organization import Organization
 from app.schemas.shop_schema import ShopCreate, ShopResponse
+from app.schemas.page_schema import Page
 from app.api.dependencies import require_roles
+from app.utils.pagination import keyset_paginate
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Shops"], prefix="/shops")
 
@@ -13,11 +18,12 @@ def create_shop(shop: ShopCreate, db: Session = Depends(get_db), current_user=De
     db.add(db_shop)
     db.commit()
     db.refresh(db_shop)
-    print(f"🛒 Shop '{db_shop.name}' created by Super Admin '{current_user.username}'")
+    logger.info("Shop '%s' created by Super Admin '%s'", db_shop.name, current_user.username)
     return db_shop
 
-@router.get("/", response_model=list[ShopResponse])
-def list_shops(db: Session = Depends(get_db), current_user=Depends(require_roles(["super_admin"]))):
-    shops = db.query(Organization).all()
-    print(f"📦 Super Admin '{current_user.username}' fetched {len(shops)} shops")
-    return shops
+@router.get("/", response_model=Page[ShopResponse])
+def list_shops(cursor: str | None = None, limit: int = Query(20, ge=1, le=100), with_total: bool = False,
+               db: Session = Depends(get_read_db), current_user=Depends(require_roles(["super_admin"]))):
+    page = keyset_paginate(db.query(Organization), Organization, cursor, limit, with_total)
+    logger.debug("Super Admin '%s' fetched %d shops", current_user.username, len(page["data"]), extra={"sample": True})
+    return page
@@ -1,18 +1,20 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from app.db.database import get_db
+from app.db.async_database import get_async_db
 from app.models.user import User
 from app.models.role import Role
 from app.models.organization import Organization
 from app.schemas.user_schema import ShopAdminCreate
 from app.api.dependencies import require_roles
+from app.core.security import hash_password
+
+logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 router = APIRouter(tags=["Users"], prefix="/users")
 
-@router.post("/shop-admin")
-def create_shop_admin(admin: ShopAdminCreate, db: Session = Depends(get_db), current_user=Depends(require_roles(["super_admin"]))):
+def check_new_shop_admin(db: Session, admin: ShopAdminCreate) -> Organization:
     # Check shop exists
     shop = db.query(Organization).filter(Organization.id == admin.shop_id).first()
     if not shop:
@@ -22,8 +24,9 @@ def create_shop_admin(admin: ShopAdminCreate, db: Session = Depends(get_db), cur
     existing_user = db.query(User).filter(User.email == admin.email).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
+    return shop
 
-    hashed_password = pwd_context.hash(admin.password)
+def save_shop_admin(db: Session, admin: ShopAdminCreate, shop: Organization, hashed_password: str) -> User:
     shop_admin_role = db.query(Role).filter(Role.name == "shop_admin").first()
     if not shop_admin_role:
         raise HTTPException(status_code=500, detail="Shop Admin role missing")
@@ -38,5 +41,16 @@ def create_shop_admin(admin: ShopAdminCreate, db: Session = Depends(get_db), cur
     db.add(user)
     db.commit()
     db.refresh(user)
-    print(f"🔑 Shop Admin '{user.username}' created for shop '{shop.name}' by Super Admin '{current_user.username}'")
+    return user
+
+@router.post("/shop-admin")
+async def create_shop_admin(admin: ShopAdminCreate, db: AsyncSession = Depends(get_async_db), current_user=Depends(require_roles(["super_admin"]))):
+    shop = await db.run_sync(check_new_shop_admin, admin)
+    shop_name = shop.name  # read now: the commit below expires it
+
+    # bcrypt runs in the password pool; the event loop just awaits it
+    hashed_password = await hash_password(admin.password)
+
+    user = await db.run_sync(save_shop_admin, admin, shop, hashed_password)
+    logger.info("Shop Admin '%s' created for shop '%s' by Super Admin '%s'", user.username, shop_name, current_user.username)
     return {"message": f"Shop Admin '{user.username}' created successfully"}
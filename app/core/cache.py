@@ -0,0 +1,217 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def size(self) -> int:
+        return len(self._data)
+
+
+class RedisCache:
+    """
+    Shared cache for multiple workers on any Redis-compatible server.
+    Size bounding is left to the server's maxmemory / LRU policy.
+    """
+
+    # network round trips: keep them off the event loop
+    blocking = True
+
+    def __init__(self, url: str, ttl: int):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("DASHBOARD_CACHE_BACKEND=redis requires the 'redis' package")
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str):
+        raw = self._client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value):
+        self._client.setex(key, self.ttl, json.dumps(value))
+
+    def counter(self, key: str) -> int:
+        return int(self._client.get(key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+    def size(self) -> int:
+        return self._client.dbsize()
+
+
+class ShopCache:
+    """
+    Caches results per shop. Each shop has a generation counter that is
+    part of every key, so invalidating a shop is a single increment and
+    stale entries simply age out.
+    """
+
+    def __init__(self, backend, namespace: str):
+        self.backend = backend
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        # sync routes look things up from several threadpool workers at once
+        self._stats_lock = threading.Lock()
+
+    def _count(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _generation(self, shop_key) -> int:
+        return self.backend.counter(f"{self.namespace}:gen:{shop_key}")
+
+    def _full_key(self, shop_id: int | None, key: str) -> str:
+        shop_key = shop_id or "all"
+        return f"{self.namespace}:{shop_key}:{self._generation(shop_key)}:{key}"
+
+    def get_or_set(self, shop_id: int | None, key: str, compute):
+        full_key = self._full_key(shop_id, key)
+
+        value = self.backend.get(full_key)
+        if value is not None:
+            self._count(hit=True)
+            return value
+
+        self._count(hit=False)
+        value = compute()
+        self.backend.set(full_key, value)
+        return value
+
+    def _bump(self, shop_id: int):
+        self.backend.incr(f"{self.namespace}:gen:{shop_id}")
+        # cross-shop (super admin) views include every shop
+        self.backend.incr(f"{self.namespace}:gen:all")
+
+    def invalidate(self, shop_id: int):
+        """
+        On the event loop (services called through run_sync) a blocking
+        backend is bumped from a worker thread instead of inline, so the
+        new generation lands a moment after the caller returns.
+        """
+        if self.backend.blocking and _on_event_loop():
+            asyncio.get_running_loop().run_in_executor(None, self._bump, shop_id)
+        else:
+            self._bump(shop_id)
+
+    async def _call(self, fn, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    async def run_cached(self, db, cached_fn, shop_id: int | None, *args):
+        """
+        Async-route form of a @cached function: the query runs through
+        db.run_sync (AsyncSession) and a blocking backend is only ever
+        called from a worker thread, never on the event loop.
+        """
+        full_key = await self._call(self._full_key, shop_id, cached_fn.cache_key(args))
+
+        value = await self._call(self.backend.get, full_key)
+        if value is not None:
+            self._count(hit=True)
+            return value
+
+        self._count(hit=False)
+        value = await db.run_sync(cached_fn.compute, shop_id, *args)
+        await self._call(self.backend.set, full_key, value)
+        return value
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": self.backend.size(),
+        }
+
+    def cached(self, name: str):
+        """Decorate `fn(db, shop_id, *args)` so results are cached per shop."""
+        def decorator(fn):
+            def cache_key(args) -> str:
+                return f"{name}:{':'.join(map(str, args))}"
+
+            @wraps(fn)
+            def wrapper(db, shop_id, *args):
+                return self.get_or_set(shop_id, cache_key(args), lambda: fn(db, shop_id, *args))
+
+            wrapper.cache_key = cache_key
+            wrapper.compute = fn
+            return wrapper
+        return decorator
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _build_backend():
+    if settings.DASHBOARD_CACHE_BACKEND == "redis":
+        return RedisCache(settings.REDIS_URL, settings.DASHBOARD_CACHE_TTL_SECONDS)
+    return MemoryCache(settings.DASHBOARD_CACHE_MAX_ENTRIES, settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+
+dashboard_cache = ShopCache(_build_backend(), "dashboard")
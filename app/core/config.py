@@ -7,6 +7,19 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str
     POSTGRES_DB: str
 
+    # Connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_ECHO: bool = False
+
+    # Optional read replica (same credentials and database name)
+    POSTGRES_REPLICA_HOST: str | None = None
+    POSTGRES_REPLICA_PORT: str | None = None
+    REPLICA_RETRY_SECONDS: int = 30
+
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
@@ -16,6 +29,59 @@ class Settings(BaseSettings):
     SUPERADMIN_EMAIL: str
     SUPERADMIN_PASSWORD: str
 
+    # Invoice numbers reserved per worker in one round trip (1 = gapless)
+    INVOICE_NUMBER_BLOCK_SIZE: int = 1
+
+    # Rows accepted by POST /invoices/bulk; one transaction holds all of them
+    INVOICE_BULK_MAX_ROWS: int = 1000
+
+    # Dashboard cache: "memory" (per worker) or "redis" (shared)
+    DASHBOARD_CACHE_BACKEND: str = "memory"
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 1024
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Resolved principals (id, shop, roles) cached per worker
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # bcrypt cost and the process pool that runs it
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Rendered invoice PDFs
+    PDF_CACHE_DIR: str = ".cache/invoice_pdfs"
+    PDF_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Batch PDF export (0 = one worker per CPU)
+    PDF_EXPORT_WORKERS: int = 0
+
+    # Monthly range partitioning of invoices/invoice_items by created_at.
+    # Existing data: python -m app.db.partitioning convert
+    INVOICE_PARTITIONING: bool = False
+    INVOICE_PARTITION_MONTHS_AHEAD: int = 3
+    INVOICE_PARTITION_CHECK_HOURS: float = 6  # in-app ensure interval; 0 = boot/cron only
+
+    # Cold storage: paid invoices older than this move to archive segments
+    ARCHIVE_AFTER_DAYS: int = 730
+    ARCHIVE_BATCH_SIZE: int = 5000
+
+    # Product search: minimum trigram word similarity for fuzzy matches
+    PRODUCT_SEARCH_FUZZY_THRESHOLD: float = 0.3
+
+    # Logging: root level, per-module overrides ("name=LEVEL,...") and the
+    # fraction of high-volume records (access log) that are kept.
+    # LOG_QUEUE=false writes from the calling thread (for comparison only)
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = ""
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_QUEUE: bool = True
+
+    # Dev/test only: per-request query recording and N+1 detection
+    QUERY_DEBUG: bool = False
+    QUERY_DEBUG_REPEAT_THRESHOLD: int = 3
+
     class Config:
         env_file = ".env"
 
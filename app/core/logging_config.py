@@ -0,0 +1,152 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import settings
+
+# Per-request fields (request_id, user_id, shop_id) shared by every record
+# logged while handling the request. A dict, so values set deeper in the
+# call stack (e.g. by get_current_user) are visible to the middleware too.
+request_context: ContextVar[dict | None] = ContextVar("request_context", default=None)
+
+_listener = None
+_configured = False
+
+
+def bind_request(**fields):
+    ctx = request_context.get()
+    if ctx is not None:
+        ctx.update(fields)
+
+
+class JsonFormatter(logging.Formatter):
+    RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "sample"}
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "request_context", None) or {})
+        entry.update({k: v for k, v in vars(record).items() if k not in self.RESERVED and k != "request_context"})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class ContextQueueHandler(QueueHandler):
+    """Captures the request context on the caller's thread, then enqueues."""
+
+    def prepare(self, record):
+        record.request_context = dict(request_context.get() or {})
+        return super().prepare(record)
+
+
+def _attach_request_context(record):
+    """Handler filter for the unqueued path: same fields ContextQueueHandler adds."""
+    record.request_context = dict(request_context.get() or {})
+    return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only LOG_SAMPLE_RATE of records logged with extra={"sample": True}."""
+
+    def filter(self, record):
+        if getattr(record, "sample", False):
+            return random.random() < settings.LOG_SAMPLE_RATE
+        return True
+
+
+def setup_logging():
+    """Route all logging through a queue to a background JSON writer thread."""
+    global _listener, _configured
+    if _configured:
+        return
+    _configured = True
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    if settings.LOG_QUEUE:
+        log_queue = queue.SimpleQueue()
+        handler = ContextQueueHandler(log_queue)
+    else:
+        handler = stream_handler
+        handler.addFilter(_attach_request_context)
+    handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    # per-module levels, e.g. "app.api.invoice=WARNING,sqlalchemy.engine=INFO"
+    for pair in filter(None, settings.LOG_LEVELS.split(",")):
+        name, _, level = pair.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    if settings.LOG_QUEUE:
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    global _listener, _configured
+    _configured = False
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+access_logger = logging.getLogger("app.access")
+
+
+class RequestLoggingMiddleware:
+    """Assigns a request id, times the request and logs one access record."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode() or uuid.uuid4().hex
+        ctx = {"request_id": request_id}
+        token = request_context.set(ctx)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            access_logger.info(
+                "request",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                    "sample": True,
+                }
+            )
+            request_context.reset(token)
@@ -0,0 +1,204 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Minimal Prometheus registry; only route templates, methods and status
+# codes are used as labels so cardinality stays bounded.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name, self.help, self.kind = name, help_text, "counter"
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        return [(self.name, labels, value) for labels, value in list(self._values.items())]
+
+
+class Gauge(Counter):
+    def __init__(self, name: str, help_text: str, collect=None):
+        super().__init__(name, help_text)
+        self.kind = "gauge"
+        self._collect = collect
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def samples(self):
+        if self._collect:
+            return [(self.name, labels, value) for labels, value in self._collect()]
+        return super().samples()
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets):
+        self.name, self.help, self.kind = name, help_text, "histogram"
+        self.buckets = buckets
+        self._values = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            row = self._values.setdefault(labels, [0] * (len(self.buckets) + 2))
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                row[index] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def samples(self):
+        out = []
+        for labels, row in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                out.append((f"{self.name}_bucket", labels + (("le", str(bound)),), cumulative))
+            out.append((f"{self.name}_bucket", labels + (("le", "+Inf"),), row[-1]))
+            out.append((f"{self.name}_sum", labels, row[-2]))
+            out.append((f"{self.name}_count", labels, row[-1]))
+        return out
+
+
+registry = []
+
+
+def register(metric):
+    registry.append(metric)
+    return metric
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def render() -> str:
+    lines = []
+    for metric in registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# 🌐 HTTP
+http_requests = register(Counter("http_requests_total", "HTTP requests by route template, method and status"))
+http_latency = register(Histogram("http_request_duration_seconds", "HTTP request latency", LATENCY_BUCKETS))
+http_in_flight = register(Gauge("http_requests_in_flight", "HTTP requests currently being served"))
+
+# 🗄 Database
+db_queries = register(Counter("db_queries_total", "SQL statements executed"))
+db_time = register(Counter("db_query_seconds_total", "Time spent executing SQL statements"))
+db_queries_per_request = register(Histogram("db_queries_per_request", "SQL statements per HTTP request", QUERY_BUCKETS))
+db_time_per_request = register(Histogram("db_time_per_request_seconds", "SQL time per HTTP request", LATENCY_BUCKETS))
+
+# Per-request query accounting; a dict so greenlet/threadpool copies share it
+request_db_stats: ContextVar[dict | None] = ContextVar("request_db_stats", default=None)
+
+_pools = {}
+
+
+# The start time lives on the execution context, not the connection: a
+# statement that raises never reaches after_cursor_execute, and anything
+# kept on the connection would leak and skew the next statement's timing.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    db_queries.inc()
+    db_time.inc(amount=elapsed)
+
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats["queries"] += 1
+        stats["time"] += elapsed
+
+
+def instrument_engine(engine, name: str):
+    """Count queries/DB time and expose pool gauges for a sync engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    _pools[name] = engine.pool
+
+
+def _pool_stats(attribute: str):
+    def collect():
+        values = []
+        for name, pool in _pools.items():
+            reader = getattr(pool, attribute, None)
+            if reader is not None:
+                values.append(((("engine", name),), reader()))
+        return values
+    return collect
+
+
+register(Gauge("db_pool_size", "Configured pool size", _pool_stats("size")))
+register(Gauge("db_pool_checked_out", "Connections currently checked out", _pool_stats("checkedout")))
+register(Gauge("db_pool_overflow", "Overflow connections in use", _pool_stats("overflow")))
+
+
+def register_stats(prefix: str, help_text: str, stats):
+    """Expose numeric fields of a `stats()` dict as gauges (caches, pools)."""
+    def collect_field(field):
+        return lambda: [((), stats()[field])]
+
+    for field, value in stats().items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            register(Gauge(f"{prefix}_{field}", f"{help_text}: {field}", collect_field(field)))
+
+
+class MetricsMiddleware:
+    """Per-route latency, status codes, in-flight requests and DB usage."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status_code = 500
+        stats = {"queries": 0, "time": 0.0}
+        token = request_db_stats.set(stats)
+        http_in_flight.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.dec()
+            request_db_stats.reset(token)
+
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            labels = (("method", scope["method"]), ("route", template))
+
+            http_requests.inc(labels + (("status", str(status_code)),))
+            http_latency.observe(labels, time.perf_counter() - started)
+            db_queries_per_request.observe(labels, stats["queries"])
+            db_time_per_request.observe(labels, stats["time"])
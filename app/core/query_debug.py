@@ -0,0 +1,119 @@
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statements recorded for the current request / assert_max_queries block.
+# A list, so greenlet and threadpool copies of the context append to it too.
+_recorded: ContextVar[list | None] = ContextVar("recorded_statements", default=None)
+
+_PARAMS = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_PARAM_LISTS = re.compile(r"\((?:\s*\?\s*,)*\s*\?\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Collapse parameters (including expanded IN lists) and whitespace."""
+    shape = _PARAMS.sub("?", statement)
+    shape = _PARAM_LISTS.sub("(?)", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+def _record(conn, cursor, statement, parameters, context, executemany):
+    recorded = _recorded.get()
+    if recorded is not None:
+        recorded.append(statement)
+
+
+_listening = False
+
+
+def enable():
+    """Record every statement on every engine (idempotent)."""
+    global _listening
+    if not _listening:
+        event.listen(Engine, "before_cursor_execute", _record)
+        _listening = True
+
+
+def suspected_n_plus_one(statements: list[str], threshold: int | None = None) -> dict:
+    """Statement shapes repeated `threshold` or more times, with their counts."""
+    threshold = threshold or settings.QUERY_DEBUG_REPEAT_THRESHOLD
+    counts = Counter(statement_shape(statement) for statement in statements)
+    return {shape: count for shape, count in counts.items() if count >= threshold}
+
+
+@contextmanager
+def record_queries():
+    enable()
+    statements = []
+    token = _recorded.set(statements)
+    try:
+        yield statements
+    finally:
+        _recorded.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_count: int):
+    """
+    Test helper: fail if the block issues more than `max_count` statements.
+
+        with assert_max_queries(3):
+            client.get("/invoices/", headers=auth)
+    """
+    with record_queries() as statements:
+        yield statements
+
+    if len(statements) > max_count:
+        repeated = suspected_n_plus_one(statements)
+        details = "\n".join(f"  {count}x {shape}" for shape, count in repeated.items())
+        raise AssertionError(
+            f"Expected at most {max_count} queries, got {len(statements)}"
+            + (f"\nRepeated statements:\n{details}" if details else "")
+        )
+
+
+class QueryDebugMiddleware:
+    """
+    Dev/test mode: reports the request's query count in X-DB-Query-Count
+    and flags repeated same-shape statements as suspected N+1.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        enable()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        statements = []
+        token = _recorded.set(statements)
+
+        async def send_with_counts(message):
+            if message["type"] == "http.response.start":
+                repeated = suspected_n_plus_one(statements)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-query-count", str(len(statements)).encode()),
+                    (b"x-db-suspected-n-plus-one", str(len(repeated)).encode()),
+                ]
+                for shape, count in repeated.items():
+                    logger.warning(
+                        "Suspected N+1: %d x %s", count, shape,
+                        extra={"path": scope["path"], "repeats": count}
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_counts)
+        finally:
+            _recorded.reset(token)
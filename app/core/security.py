@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from app.core.config import settings
+
+# min == max == default, so hashes made with any other cost "need update"
+# and get transparently rehashed on the next successful login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasherPool:
+    """
+    Runs bcrypt in a bounded process pool so a burst of logins burns
+    its own cores instead of the API threadpool. Callers beyond
+    `max_pending` are turned away with 503 rather than queueing forever.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(status_code=503, detail="Too many concurrent logins, retry shortly")
+            if self._executor is None:
+                # spawn, not fork: forking a process that runs threads and
+                # holds DB connections can copy held locks and shared sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            self.in_flight += 1
+
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": max(self.in_flight - self.workers, 0),
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordHasherPool(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def hash_password(password: str) -> str:
+    future = password_pool.submit(_hash, password)
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password(plain_password: str, hashed_password: str):
+    """Returns (is_valid, new_hash); new_hash is set when the cost changed."""
+    future = password_pool.submit(_verify_and_update, plain_password, hashed_password)
+    return await asyncio.wrap_future(future)
@@ -0,0 +1,57 @@
+import logging
+import time
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.db import database
+from app.db.database import DATABASE_URL, POOL_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+# asyncpg engine for the high-concurrency endpoints; same pool settings
+async_engine = create_async_engine(
+    DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+    **POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=True)
+
+async_read_engine = None
+AsyncReadSessionLocal = None
+
+if database.read_engine is not None:
+    async_read_engine = create_async_engine(
+        database.READ_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+        **POOL_OPTIONS
+    )
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, class_=AsyncSession, autoflush=False)
+
+
+async def async_read_session() -> AsyncSession:
+    """Async counterpart of database.read_session(), sharing its replica health."""
+    if AsyncReadSessionLocal is None or time.monotonic() < database._replica_down_until:
+        return AsyncSessionLocal()
+
+    db = AsyncReadSessionLocal()
+    try:
+        await db.connection()
+        return db
+    except (DBAPIError, OSError):
+        await db.close()
+        database._replica_down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        logger.warning("Read replica unavailable, falling back to primary")
+        return AsyncSessionLocal()
+
+
+# Dependency for async routes
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dependency for async read-only routes (replica when available)
+async def get_async_read_db():
+    db = await async_read_session()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,18 +1,69 @@
+import logging
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings  # import settings from step 3
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = (
     f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
     f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
 )
 
-engine = create_engine(DATABASE_URL, echo=True)
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    echo=settings.DB_ECHO,
+)
+
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Optional read replica for dashboards, reports and listings
+read_engine = None
+ReadSessionLocal = None
+
+if settings.POSTGRES_REPLICA_HOST:
+    READ_DATABASE_URL = (
+        f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+        f"@{settings.POSTGRES_REPLICA_HOST}:{settings.POSTGRES_REPLICA_PORT or settings.POSTGRES_PORT}"
+        f"/{settings.POSTGRES_DB}"
+    )
+    read_engine = create_engine(READ_DATABASE_URL, **POOL_OPTIONS)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+_replica_down_until = 0.0
+
+
+def read_session():
+    """
+    Session on the read replica, or on the primary when no replica is
+    configured or it was unreachable within the last REPLICA_RETRY_SECONDS.
+    """
+    global _replica_down_until
+
+    if ReadSessionLocal is None or time.monotonic() < _replica_down_until:
+        return SessionLocal()
+
+    db = ReadSessionLocal()
+    try:
+        db.connection()
+        return db
+    except OperationalError:
+        db.close()
+        _replica_down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        logger.warning("Read replica unavailable, falling back to primary")
+        return SessionLocal()
+
+
 # Dependency for FastAPI routes
 def get_db():
     db = SessionLocal()
@@ -20,3 +71,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency for read-only routes (replica when available)
+def get_read_db():
+    db = read_session()
+    try:
+        yield db
+    finally:
+        db.close()
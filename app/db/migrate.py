@@ -0,0 +1,15 @@
+# app/db/migrate.py
+#
+# Apply pending schema migrations:  python -m app.db.migrate
+
+from app.db.database import engine
+from app.db.migrations import run_migrations
+
+
+def main():
+    applied = run_migrations(engine)
+    print(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none pending'}")
+
+
+if __name__ == "__main__":
+    main()
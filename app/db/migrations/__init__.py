@@ -0,0 +1,91 @@
+"""
+Versioned schema migrations.
+
+Each module named ``mNNNN_<description>.py`` in this package defines
+``upgrade(conn)``. Migrations run in version order and are recorded in
+``schema_migrations``. Set ``TRANSACTIONAL = False`` in a module for
+statements that can't run inside a transaction (CREATE INDEX CONCURRENTLY);
+it then runs on an autocommit connection and must be idempotent.
+"""
+import importlib
+import logging
+import pkgutil
+import re
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+_MODULE_NAME = re.compile(r"^m(\d{4})_\w+$")
+
+
+def discover() -> list:
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        match = _MODULE_NAME.match(module_info.name)
+        if match:
+            module = importlib.import_module(f"{__name__}.{module_info.name}")
+            migrations.append((int(match.group(1)), module_info.name, module))
+    return sorted(migrations, key=lambda migration: migration[0])
+
+
+def applied_versions(engine) -> set[int]:
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version INTEGER PRIMARY KEY,"
+            " name VARCHAR NOT NULL,"
+            " applied_at TIMESTAMP NOT NULL DEFAULT now())"
+        ))
+        return {row.version for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def _record(conn, version: int, name: str):
+    conn.execute(
+        text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+        {"version": version, "name": name}
+    )
+
+
+def run_migrations(engine) -> list[str]:
+    """Apply pending migrations; returns the names that were applied."""
+    done = applied_versions(engine)
+    applied = []
+
+    for version, name, module in discover():
+        if version in done:
+            continue
+
+        logger.info("Applying migration %s", name)
+
+        if getattr(module, "TRANSACTIONAL", True):
+            with engine.begin() as conn:
+                module.upgrade(conn)
+                _record(conn, version, name)
+        else:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                module.upgrade(conn)
+                _record(conn, version, name)
+
+        applied.append(name)
+
+    return applied
+
+
+def create_index_concurrently(
+    conn, name: str, table: str, columns: str, using: str | None = None, unique: bool = False
+):
+    """
+    CREATE INDEX CONCURRENTLY that can be safely retried: an INVALID index
+    left behind by an interrupted build is dropped and rebuilt.
+    """
+    invalid = conn.execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+        " WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).first()
+    if invalid:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    method = f" USING {using}" if using else ""
+    conn.execute(text(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table}{method} ({columns})"))
@@ -0,0 +1,116 @@
+"""
+Baseline: the schema as it stood before versioned migrations, i.e. what
+the old create_all built. Defined here rather than taken from the models
+so a fresh database replays the same history as an upgraded one; later
+changes belong in their own migrations. Tables that already exist are
+left alone.
+"""
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Float, ForeignKey, Integer, MetaData, String, Table
+)
+
+metadata = MetaData()
+
+Table(
+    "organizations", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("address", String, nullable=True),
+    Column("phone", String, nullable=True),
+    Column("email", String, nullable=True),
+    Column("status", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String, unique=True, nullable=False),
+    Column("email", String, unique=True, nullable=False),
+    Column("hashed_password", String, nullable=False),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("organization_id", Integer, ForeignKey("organizations.id"), nullable=True),
+)
+
+Table(
+    "roles", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, unique=True, nullable=False),
+    Column("description", String, nullable=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "user_roles", metadata,
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("role_id", Integer, ForeignKey("roles.id")),
+)
+
+Table(
+    "products", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("description", String, nullable=True),
+    Column("price", Float, nullable=False),
+    Column("quantity", Integer, nullable=False),
+    Column("shop_id", Integer, ForeignKey("organizations.id"), nullable=False),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "invoices", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("invoice_number", String, unique=True, index=True),
+    Column("customer_name", String, nullable=False),
+    Column("customer_email", String, nullable=True),
+    Column("sub_total", Float),
+    Column("tax_rate", Float),
+    Column("tax_amount", Float),
+    Column("discount_type", String, nullable=True),
+    Column("discount_value", Float),
+    Column("discount_amount", Float),
+    Column("grand_total", Float),
+    Column("payment_method", String, nullable=True),
+    Column("payment_status", String),
+    Column("shop_id", Integer, ForeignKey("organizations.id"), nullable=False),
+    Column("created_by_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "invoice_items", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("invoice_id", Integer, ForeignKey("invoices.id"), nullable=False),
+    Column("product_id", Integer, ForeignKey("products.id"), nullable=False),
+    Column("quantity", Integer, nullable=False),
+    Column("price", Float, nullable=False),
+    Column("total_price", Float, nullable=False),
+)
+
+Table(
+    "invoice_sequences", metadata,
+    Column("shop_id", Integer, ForeignKey("organizations.id"), primary_key=True),
+    Column("year", Integer, primary_key=True),
+    Column("last_value", Integer, nullable=False),
+)
+
+Table(
+    "daily_revenue", metadata,
+    Column("shop_id", Integer, ForeignKey("organizations.id"), primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("revenue", Float, nullable=False),
+    Column("tax", Float, nullable=False),
+    Column("discount", Float, nullable=False),
+    Column("invoice_count", Integer, nullable=False),
+    Column("paid_count", Integer, nullable=False),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(bind=conn)
@@ -0,0 +1,20 @@
+"""Composite indexes for tenant-scoped access paths, built without table locks."""
+from app.db.migrations import create_index_concurrently
+
+TRANSACTIONAL = False
+
+INDEXES = [
+    ("ix_invoices_shop_created", "invoices", "shop_id, created_at, id"),
+    ("ix_invoices_shop_status_created", "invoices", "shop_id, payment_status, created_at"),
+    ("ix_invoices_created", "invoices", "created_at, id"),
+    ("ix_invoice_items_invoice_id", "invoice_items", "invoice_id"),
+    ("ix_products_shop_created", "products", "shop_id, created_at, id"),
+    ("ix_organizations_created", "organizations", "created_at, id"),
+    ("ix_user_roles_user_id", "user_roles", "user_id"),
+    ("ix_user_roles_role_id", "user_roles", "role_id"),
+]
+
+
+def upgrade(conn):
+    for name, table, columns in INDEXES:
+        create_index_concurrently(conn, name, table, columns)
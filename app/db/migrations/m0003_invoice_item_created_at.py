@@ -0,0 +1,27 @@
+"""
+invoice_items.invoice_created_at: a copy of the parent invoice's
+created_at, used as the partition key. Backfilled in batches so the
+update never holds locks on the whole table.
+"""
+from sqlalchemy import text
+
+TRANSACTIONAL = False
+
+BATCH_SIZE = 50_000
+
+
+def upgrade(conn):
+    conn.execute(text("ALTER TABLE invoice_items ADD COLUMN IF NOT EXISTS invoice_created_at TIMESTAMP"))
+
+    last_id = conn.execute(text("SELECT coalesce(max(id), 0) FROM invoice_items")).scalar()
+    for start in range(0, last_id, BATCH_SIZE):
+        conn.execute(
+            text(
+                "UPDATE invoice_items AS item SET invoice_created_at = invoice.created_at"
+                " FROM invoices AS invoice"
+                " WHERE invoice.id = item.invoice_id"
+                " AND item.invoice_created_at IS NULL"
+                " AND item.id > :start AND item.id <= :stop"
+            ),
+            {"start": start, "stop": start + BATCH_SIZE}
+        )
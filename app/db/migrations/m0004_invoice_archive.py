@@ -0,0 +1,41 @@
+"""Cold-storage tables for archived invoices (as first shipped; see app.models.invoice_archive)."""
+from sqlalchemy import (
+    Column, Date, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, MetaData, String, Table
+)
+
+metadata = MetaData()
+
+# referenced by the foreign keys only; not created here
+Table("organizations", metadata, Column("id", Integer, primary_key=True))
+
+segments = Table(
+    "invoice_archive_segments", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("shop_id", Integer, ForeignKey("organizations.id"), nullable=False),
+    Column("month", Date, nullable=False),
+    Column("invoice_count", Integer, nullable=False),
+    Column("payload", LargeBinary, nullable=False),
+    Column("checksum", String(64), nullable=False),
+    Column("created_at", DateTime),
+    Index("ix_invoice_archive_segments_shop_month", "shop_id", "month"),
+)
+
+archived_invoices = Table(
+    "archived_invoices", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("invoice_number", String, nullable=False, index=True),
+    Column("shop_id", Integer, ForeignKey("organizations.id"), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("payment_status", String, nullable=False),
+    Column("grand_total", Float, nullable=False),
+    Column("tax_amount", Float, nullable=False),
+    Column("discount_amount", Float, nullable=False),
+    Column("segment_id", Integer, ForeignKey("invoice_archive_segments.id"), nullable=False, index=True),
+    Column("checksum", String(64), nullable=False),
+    Column("archived_at", DateTime),
+    Index("ix_archived_invoices_shop_created", "shop_id", "created_at", "id"),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(bind=conn, tables=[segments, archived_invoices])
@@ -0,0 +1,30 @@
+"""
+Product search indexes, scoped by shop:
+- btree on lower(name) in C collation for type-ahead prefixes (serves
+  both the LIKE 'abc%' range and the alphabetical order)
+- trigram GiST over name + description for fuzzy, nearest-first lookups
+  (btree_gist lets shop_id share the GiST index)
+
+These live here rather than on the model: they need the pg_trgm and
+btree_gist extensions, which create_all can't install.
+"""
+from sqlalchemy import text
+
+from app.db.migrations import create_index_concurrently
+
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+
+    create_index_concurrently(
+        conn, "ix_products_shop_name_prefix", "products",
+        'shop_id, (lower(name) COLLATE "C")'
+    )
+    create_index_concurrently(
+        conn, "ix_products_shop_search_trgm", "products",
+        "shop_id, (lower(name || ' ' || coalesce(description, ''))) gist_trgm_ops",
+        using="gist"
+    )
@@ -0,0 +1,43 @@
+"""
+Invoice numbers restart at 000001 for every shop and year, so they are
+unique per shop, not across the table: replace the table-wide unique
+index on invoice_number with UNIQUE (shop_id, invoice_number).
+
+A partitioned invoices table can't carry that constraint (it would need
+created_at) and already has a plain invoice_number index, so it's left
+alone.
+"""
+from sqlalchemy import text
+
+from app.db.migrations import create_index_concurrently
+
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    partitioned = conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid"
+        " WHERE c.relname = 'invoices'"
+    )).first()
+    if partitioned:
+        return
+
+    create_index_concurrently(
+        conn, "uq_invoices_shop_invoice_number", "invoices", "shop_id, invoice_number", unique=True
+    )
+    has_constraint = conn.execute(text(
+        "SELECT 1 FROM pg_constraint WHERE conname = 'uq_invoices_shop_invoice_number'"
+    )).first()
+    if not has_constraint:
+        conn.execute(text(
+            "ALTER TABLE invoices ADD CONSTRAINT uq_invoices_shop_invoice_number"
+            " UNIQUE USING INDEX uq_invoices_shop_invoice_number"
+        ))
+
+    table_wide_unique = conn.execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+        " WHERE c.relname = 'ix_invoices_invoice_number' AND i.indisunique"
+    )).first()
+    if table_wide_unique:
+        conn.execute(text("DROP INDEX CONCURRENTLY ix_invoices_invoice_number"))
+    create_index_concurrently(conn, "ix_invoices_invoice_number", "invoices", "invoice_number")
@@ -0,0 +1,33 @@
+"""
+Backfill the daily_revenue rollup from existing invoices (live and
+archived). The table starts empty on databases that predate the rollup,
+which left dashboards showing no revenue for all earlier history. Only
+runs against an empty rollup; app.utils.rebuild_revenue_rollup remains
+the way to rebuild it later.
+"""
+from sqlalchemy import text
+
+BACKFILL = text("""
+INSERT INTO daily_revenue (shop_id, day, revenue, tax, discount, invoice_count, paid_count)
+SELECT
+    shop_id,
+    created_at::date,
+    coalesce(sum(grand_total), 0),
+    coalesce(sum(tax_amount), 0),
+    coalesce(sum(discount_amount), 0),
+    count(*),
+    count(*) FILTER (WHERE payment_status = 'paid')
+FROM (
+    SELECT shop_id, created_at, grand_total, tax_amount, discount_amount, payment_status FROM invoices
+    UNION ALL
+    SELECT shop_id, created_at, grand_total, tax_amount, discount_amount, payment_status FROM archived_invoices
+) AS all_invoices
+WHERE created_at IS NOT NULL
+GROUP BY shop_id, created_at::date
+""")
+
+
+def upgrade(conn):
+    if conn.execute(text("SELECT EXISTS (SELECT 1 FROM daily_revenue)")).scalar():
+        return
+    conn.execute(BACKFILL)
@@ -0,0 +1,26 @@
+"""
+invoices.updated_at: bumped whenever anything printed on the invoice
+changes, so it versions the invoice's PDF (cache key, ETag and
+Last-Modified) without reading its items. Backfilled from created_at in
+batches, like m0003.
+"""
+from sqlalchemy import text
+
+TRANSACTIONAL = False
+
+BATCH_SIZE = 50_000
+
+
+def upgrade(conn):
+    conn.execute(text("ALTER TABLE invoices ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP"))
+
+    last_id = conn.execute(text("SELECT coalesce(max(id), 0) FROM invoices")).scalar()
+    for start in range(0, last_id, BATCH_SIZE):
+        conn.execute(
+            text(
+                "UPDATE invoices SET updated_at = created_at"
+                " WHERE updated_at IS NULL"
+                " AND id > :start AND id <= :stop"
+            ),
+            {"start": start, "stop": start + BATCH_SIZE}
+        )
@@ -0,0 +1,327 @@
+# app/db/partitioning.py
+#
+# Optional monthly range partitioning of invoices and invoice_items by
+# created_at (settings.INVOICE_PARTITIONING).
+#
+#   python -m app.db.partitioning convert [--keep-old]   # existing data
+#   python -m app.db.partitioning ensure                 # upcoming months (cron)
+#
+# With partitioning on, each app worker also re-runs `ensure` every
+# INVOICE_PARTITION_CHECK_HOURS (start_partition_maintenance), so a
+# long-running deployment never reaches a month without a partition even
+# if no cron job is set up.
+#
+# Postgres requires the partition key in every primary key and unique
+# index, so once partitioned:
+#   invoices       PK (id, created_at); invoice_number is only indexed, the
+#                  UNIQUE (shop_id, invoice_number) constraint can't be kept
+#   invoice_items  PK (id, invoice_created_at), FK (invoice_id,
+#                  invoice_created_at) -> invoices (id, created_at)
+
+import argparse
+import logging
+import threading
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.models.invoice import Invoice, InvoiceItem
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for pg_advisory_xact_lock: one ensure_partitions at a time
+# across workers, so two never race to create the same partition
+ENSURE_LOCK_KEY = 7_340_911_023
+
+_maintenance_thread = None
+_maintenance_stop = threading.Event()
+
+# table -> partition key column
+PARTITIONED_TABLES = {
+    Invoice.__table__: "created_at",
+    InvoiceItem.__table__: "invoice_created_at",
+}
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(first: date, last: date) -> list[date]:
+    """First day of every month from `first`'s month to `last`'s, inclusive."""
+    month = first.replace(day=1)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid"
+            " WHERE c.relname = :table"
+        ),
+        {"table": table}
+    ).first() is not None
+
+
+def create_partitions(conn, table: str, months: list[date], parent: str | None = None) -> list[str]:
+    """Create the monthly partitions of `table` that don't exist yet."""
+    created = []
+    for month in months:
+        name = partition_name(table, month)
+        exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if exists:
+            continue
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {parent or table}"
+            f" FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+        ))
+        created.append(name)
+    return created
+
+
+def ensure_partitions(engine, months_ahead: int | None = None) -> list[str]:
+    """
+    Create partitions from the current month through `months_ahead`
+    months out. Indexes and constraints on the parent are applied to new
+    partitions automatically.
+    """
+    if months_ahead is None:
+        months_ahead = settings.INVOICE_PARTITION_MONTHS_AHEAD
+
+    this_month = datetime.utcnow().date().replace(day=1)
+    months = months_between(this_month, add_months(this_month, months_ahead))
+
+    created = []
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ENSURE_LOCK_KEY})
+        for table in PARTITIONED_TABLES:
+            if is_partitioned(conn, table.name):
+                created += create_partitions(conn, table.name, months)
+
+    if created:
+        logger.info("Created invoice partitions: %s", ", ".join(created))
+    return created
+
+
+def _maintain_partitions(engine, interval: float):
+    while not _maintenance_stop.wait(interval):
+        try:
+            ensure_partitions(engine)
+        except Exception:
+            logger.exception("Invoice partition maintenance failed; retrying in %.0fs", interval)
+
+
+def start_partition_maintenance(engine):
+    """Run ensure_partitions every INVOICE_PARTITION_CHECK_HOURS in a daemon thread."""
+    global _maintenance_thread
+    if _maintenance_thread is not None or settings.INVOICE_PARTITION_CHECK_HOURS <= 0:
+        return
+
+    _maintenance_stop.clear()
+    _maintenance_thread = threading.Thread(
+        target=_maintain_partitions,
+        args=(engine, settings.INVOICE_PARTITION_CHECK_HOURS * 3600),
+        name="invoice-partitions",
+        daemon=True
+    )
+    _maintenance_thread.start()
+
+
+def stop_partition_maintenance():
+    global _maintenance_thread
+    if _maintenance_thread is not None:
+        _maintenance_stop.set()
+        _maintenance_thread.join()
+        _maintenance_thread = None
+
+
+def drop_empty_partitions(engine, before: date) -> list[str]:
+    """
+    Detach and drop monthly partitions that end on or before `before` and
+    hold no rows, e.g. once the archive job has emptied them.
+    """
+    dropped = []
+    with engine.begin() as conn:
+        # invoice_items first: its partitions reference invoices'
+        for table in reversed(list(PARTITIONED_TABLES)):
+            if not is_partitioned(conn, table.name):
+                continue
+
+            partitions = conn.execute(
+                text(
+                    "SELECT c.relname FROM pg_inherits i"
+                    " JOIN pg_class c ON c.oid = i.inhrelid"
+                    " JOIN pg_class p ON p.oid = i.inhparent"
+                    " WHERE p.relname = :table"
+                ),
+                {"table": table.name}
+            ).scalars().all()
+
+            for name in partitions:
+                month = datetime.strptime(name.rsplit("_p", 1)[1], "%Y%m").date()
+                if add_months(month, 1) > before:
+                    continue
+                if conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+                    continue
+                conn.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {name}"))
+                conn.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+
+    if dropped:
+        logger.info("Dropped empty invoice partitions: %s", ", ".join(dropped))
+    return dropped
+
+
+def _index_statements(table, target: str) -> list[str]:
+    # Unique indexes can't be enforced without the partition key, so every
+    # model index is recreated as a plain one
+    return [
+        f"CREATE INDEX {index.name} ON {target} ({', '.join(column.name for column in index.columns)})"
+        for index in table.indexes
+    ]
+
+
+def convert(engine, keep_old: bool = False):
+    """
+    Rebuild invoices and invoice_items as partitioned tables and copy the
+    existing rows across, in one transaction. Both tables are locked for
+    the duration, so run it in a maintenance window on large databases.
+
+    With keep_old the original tables are kept as *_unpartitioned
+    (their indexes renamed to match) instead of dropped.
+    """
+    invoices, items = Invoice.__table__.name, InvoiceItem.__table__.name
+    item_columns = [column.name for column in InvoiceItem.__table__.columns]
+
+    with engine.begin() as conn:
+        if is_partitioned(conn, invoices):
+            logger.info("invoices is already partitioned")
+            return
+
+        conn.execute(text(f"LOCK TABLE {invoices}, {items} IN ACCESS EXCLUSIVE MODE"))
+
+        missing_key = conn.execute(text(f"SELECT count(*) FROM {invoices} WHERE created_at IS NULL")).scalar()
+        if missing_key:
+            raise RuntimeError(f"{missing_key} invoices have no created_at; set it before partitioning")
+
+        first, last = conn.execute(text(f"SELECT min(created_at), max(created_at) FROM {invoices}")).one()
+        this_month = datetime.utcnow().date().replace(day=1)
+        months = months_between(
+            min(first.date(), this_month) if first else this_month,
+            add_months(max(last.date(), this_month) if last else this_month, settings.INVOICE_PARTITION_MONTHS_AHEAD)
+        )
+
+        # New parents: same columns and defaults (including the id sequences)
+        for table, key in PARTITIONED_TABLES.items():
+            conn.execute(text(
+                f"CREATE TABLE {table.name}_new (LIKE {table.name} INCLUDING DEFAULTS)"
+                f" PARTITION BY RANGE ({key})"
+            ))
+            conn.execute(text(f"ALTER TABLE {table.name}_new ALTER COLUMN {key} SET NOT NULL"))
+            create_partitions(conn, table.name, months, parent=f"{table.name}_new")
+
+        conn.execute(text(f"INSERT INTO {invoices}_new SELECT * FROM {invoices}"))
+        select_items = ", ".join(
+            "coalesce(item.invoice_created_at, invoice.created_at)" if name == "invoice_created_at" else f"item.{name}"
+            for name in item_columns
+        )
+        conn.execute(text(
+            f"INSERT INTO {items}_new ({', '.join(item_columns)})"
+            f" SELECT {select_items} FROM {items} AS item"
+            f" JOIN {invoices} AS invoice ON invoice.id = item.invoice_id"
+        ))
+
+        # The id sequences belong to the old tables; detach them first so
+        # dropping or renaming those doesn't take the sequences along
+        sequences = {}
+        for table in (invoices, items):
+            sequences[table] = conn.execute(text(f"SELECT pg_get_serial_sequence('{table}', 'id')")).scalar()
+            conn.execute(text(f"ALTER SEQUENCE {sequences[table]} OWNED BY NONE"))
+
+        if keep_old:
+            for table in (items, invoices):
+                index_names = conn.execute(
+                    text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": table}
+                ).scalars().all()
+                for name in index_names:
+                    conn.execute(text(f"ALTER INDEX {name} RENAME TO {name}_unpartitioned"))
+                conn.execute(text(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned"))
+        else:
+            conn.execute(text(f"DROP TABLE {items}"))
+            conn.execute(text(f"DROP TABLE {invoices}"))
+
+        for table in (invoices, items):
+            conn.execute(text(f"ALTER TABLE {table}_new RENAME TO {table}"))
+            conn.execute(text(f"ALTER SEQUENCE {sequences[table]} OWNED BY {table}.id"))
+
+        for table, key in PARTITIONED_TABLES.items():
+            conn.execute(text(f"ALTER TABLE {table.name} ADD PRIMARY KEY (id, {key})"))
+        conn.execute(text(f"ALTER TABLE {invoices} ADD FOREIGN KEY (shop_id) REFERENCES organizations (id)"))
+        conn.execute(text(f"ALTER TABLE {invoices} ADD FOREIGN KEY (created_by_id) REFERENCES users (id)"))
+        conn.execute(text(f"ALTER TABLE {items} ADD FOREIGN KEY (product_id) REFERENCES products (id)"))
+        conn.execute(text(
+            f"ALTER TABLE {items} ADD FOREIGN KEY (invoice_id, invoice_created_at)"
+            f" REFERENCES {invoices} (id, created_at)"
+        ))
+
+        for table in PARTITIONED_TABLES:
+            for statement in _index_statements(table, table.name):
+                conn.execute(text(statement))
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"ANALYZE {invoices}"))
+        conn.execute(text(f"ANALYZE {items}"))
+
+    logger.info("Partitioned invoices and invoice_items into %d monthly partitions each", len(months))
+
+
+def bootstrap_partitions(engine):
+    """
+    Startup hook (settings.INVOICE_PARTITIONING): partition a still-empty
+    schema in place, then make sure upcoming months have partitions.
+    Populated unpartitioned tables are left for an explicit `convert`.
+    """
+    with engine.connect() as conn:
+        partitioned = is_partitioned(conn, Invoice.__table__.name)
+        empty = partitioned or conn.execute(text("SELECT NOT EXISTS (SELECT 1 FROM invoices)")).scalar()
+
+    if not partitioned:
+        if not empty:
+            logger.warning(
+                "INVOICE_PARTITIONING is on but invoices is not partitioned; "
+                "run: python -m app.db.partitioning convert"
+            )
+            return
+        convert(engine)
+
+    ensure_partitions(engine)
+
+
+def main():
+    from app.db.database import engine
+
+    parser = argparse.ArgumentParser(description="Invoice table partitioning")
+    parser.add_argument("command", choices=["convert", "ensure"])
+    parser.add_argument("--keep-old", action="store_true", help="keep the unpartitioned tables (convert)")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        convert(engine, keep_old=args.keep_old)
+        ensure_partitions(engine)
+    else:
+        created = ensure_partitions(engine)
+        print(f"Created {len(created)} partition(s): {', '.join(created) or 'none needed'}")
+
+
+if __name__ == "__main__":
+    main()
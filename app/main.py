@@ -1,10 +1,20 @@
 # app/main.py
 
+import logging
 from fastapi import FastAPI
-from app.db.database import engine, Base
-from app.models import user, role, organization, association
+from fastapi.responses import PlainTextResponse
+from app.core.logging_config import RequestLoggingMiddleware, setup_logging, shutdown_logging
+from app.core import metrics
+from app.core.config import settings
+from app.core.query_debug import QueryDebugMiddleware
+from app.core.cache import dashboard_cache
+from app.db.database import engine, read_engine
+from app.db.async_database import async_engine, async_read_engine
+from app import models  # noqa: F401 - register every mapper before the routers use them
+from app.db.partitioning import start_partition_maintenance, stop_partition_maintenance
 from app.api.auth import router as auth_router
-from app.utils.startup import init_system  # Import startup function
+from app.utils.startup import bootstrap  # Import startup function
+from app.core.security import password_pool
 from app.api.shop import router as shop_router
 from app.api.user_admin import router as user_admin_router
 from app.api.product import router as product_router
@@ -12,16 +22,30 @@ from app.api.invoice import router as invoice_router
 from app.api.invoice_pdf import router as invoice_pdf_router
 from app.api.reports import router as report_router
 from app.api.dashboard import router as dashboard_router
+from app.services.pdf_cache import pdf_cache
+from app.services import pdf_export_service
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="InvoiceHub - Role Based System")
+app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+if settings.QUERY_DEBUG:
+    app.add_middleware(QueryDebugMiddleware)
+
+# Instrumentation
+metrics.instrument_engine(engine, "primary")
+metrics.instrument_engine(async_engine.sync_engine, "primary_async")
+if read_engine is not None:
+    metrics.instrument_engine(read_engine, "replica")
+    metrics.instrument_engine(async_read_engine.sync_engine, "replica_async")
+metrics.register_stats("password_pool", "bcrypt process pool", password_pool.stats)
+metrics.register_stats("dashboard_cache", "Dashboard cache", dashboard_cache.stats)
+metrics.register_stats("pdf_cache", "Invoice PDF cache", pdf_cache.stats)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
-print("📦 Database tables created (if not exist)")
 
 # Include auth router
 app.include_router(auth_router, prefix="/auth")
-print("🔑 Auth router included at /auth")
 app.include_router(shop_router)
 app.include_router(user_admin_router)
 app.include_router(product_router)
@@ -36,7 +60,23 @@ app.include_router(dashboard_router)
 # Run initialization at startup
 @app.on_event("startup")
 def startup_event():
-    init_system()
+    # Here rather than at import, so importing the app (tests, scripts,
+    # benchmarks) doesn't take over the root logger or start a thread
+    setup_logging()
+    bootstrap()
+    if settings.INVOICE_PARTITIONING:
+        start_partition_maintenance(engine)
+
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_partition_maintenance()
+    password_pool.shutdown()
+    pdf_export_service.shutdown()
+    shutdown_logging()
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,6 @@
+# Importing the package registers every model on Base.metadata, so
+# relationships declared by name ("Organization", "User", ...) resolve
+# no matter which model a process happens to import first.
+from app.models import (  # noqa: F401
+    association, daily_revenue, invoice, invoice_archive, invoice_sequence, organization, product, role, user
+)
@@ -1,9 +1,11 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from app.db.database import Base
 
 user_roles = Table(
     "user_roles",
     Base.metadata,
     Column("user_id", Integer, ForeignKey("users.id")),
-    Column("role_id", Integer, ForeignKey("roles.id"))
+    Column("role_id", Integer, ForeignKey("roles.id")),
+    Index("ix_user_roles_user_id", "user_id"),
+    Index("ix_user_roles_role_id", "role_id")
 )
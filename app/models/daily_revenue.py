@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from app.db.database import Base
+
+class DailyRevenue(Base):
+    """
+    Per-shop, per-day (UTC) invoice rollup used by the dashboard.
+    Maintained in the same transaction that creates invoices.
+    """
+    __tablename__ = "daily_revenue"
+
+    shop_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    revenue = Column(Float, nullable=False, default=0)
+    tax = Column(Float, nullable=False, default=0)
+    discount = Column(Float, nullable=False, default=0)
+    invoice_count = Column(Integer, nullable=False, default=0)
+    paid_count = Column(Integer, nullable=False, default=0)
@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Float, ForeignKey, DateTime, UniqueConstraint
+    Column, Integer, String, Float, ForeignKey, DateTime, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -7,9 +7,18 @@ from app.db.database import Base
 
 class Invoice(Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        # tenant-scoped listings / keyset pagination / date-range aggregates
+        Index("ix_invoices_shop_created", "shop_id", "created_at", "id"),
+        Index("ix_invoices_shop_status_created", "shop_id", "payment_status", "created_at"),
+        # cross-shop (super admin) listings
+        Index("ix_invoices_created", "created_at", "id"),
+        # numbers come from a per-shop counter, so they're unique per shop
+        UniqueConstraint("shop_id", "invoice_number", name="uq_invoices_shop_invoice_number"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    invoice_number = Column(String, unique=True, index=True)
+    invoice_number = Column(String, index=True)
 
     customer_name = Column(String, nullable=False)
     customer_email = Column(String, nullable=True)
@@ -29,6 +38,9 @@ class Invoice(Base):
     shop_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
     created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped whenever anything printed on the invoice changes (e.g. a
+    # product rename): versions its PDF without reading the items
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     shop = relationship("Organization", back_populates="invoices")
     created_by = relationship("User")
@@ -40,6 +52,9 @@ class Invoice(Base):
 
 class InvoiceItem(Base):
     __tablename__ = "invoice_items"
+    __table_args__ = (
+        Index("ix_invoice_items_invoice_id", "invoice_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False)
@@ -47,6 +62,8 @@ class InvoiceItem(Base):
     quantity = Column(Integer, nullable=False)
     price = Column(Float, nullable=False)
     total_price = Column(Float, nullable=False)
+    # Copy of invoices.created_at: the partition key when partitioned
+    invoice_created_at = Column(DateTime, nullable=True)
 
     invoice = relationship("Invoice", back_populates="items")
     product = relationship("Product")
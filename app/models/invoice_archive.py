@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, LargeBinary, Index
+from datetime import datetime
+from app.db.database import Base
+
+class InvoiceArchiveSegment(Base):
+    """
+    Cold storage for paid invoices past ARCHIVE_AFTER_DAYS: one gzip'd
+    NDJSON blob (an invoice with its items per line) per shop, month and
+    archive run.
+    """
+    __tablename__ = "invoice_archive_segments"
+    __table_args__ = (
+        Index("ix_invoice_archive_segments_shop_month", "shop_id", "month"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    shop_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    month = Column(Date, nullable=False)
+    invoice_count = Column(Integer, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+    checksum = Column(String(64), nullable=False)  # sha256 of payload
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ArchivedInvoice(Base):
+    """
+    Index row left behind for an archived invoice: enough to find, filter
+    and total it without opening its segment.
+    """
+    __tablename__ = "archived_invoices"
+    __table_args__ = (
+        Index("ix_archived_invoices_shop_created", "shop_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)  # the original invoices.id
+    invoice_number = Column(String, nullable=False, index=True)
+    shop_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    payment_status = Column(String, nullable=False)
+    grand_total = Column(Float, nullable=False)
+    tax_amount = Column(Float, nullable=False)
+    discount_amount = Column(Float, nullable=False)
+
+    segment_id = Column(Integer, ForeignKey("invoice_archive_segments.id"), nullable=False, index=True)
+    checksum = Column(String(64), nullable=False)  # sha256 of the archived record
+    archived_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.db.database import Base
+
+class InvoiceSequence(Base):
+    """
+    Per-shop, per-year invoice counter.
+    Advanced atomically with INSERT ... ON CONFLICT DO UPDATE ... RETURNING.
+    """
+    __tablename__ = "invoice_sequences"
+
+    shop_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_shop_created", "shop_id", "created_at", "id"),
+        # name/description search indexes need pg_trgm: see migration m0005
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
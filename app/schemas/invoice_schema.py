@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 
 
 class InvoiceItemCreate(BaseModel):
@@ -19,6 +19,7 @@ class InvoiceCreate(BaseModel):
     tax_rate: Optional[float] = Field(default=0, ge=0, le=100)
     payment_method: Optional[str] = None  # ✅ New
     payment_status: Optional[str] = Field(default="paid")
+    shop_id: Optional[int] = None  # required for super admin
     items: List[InvoiceItemCreate]
     
 
@@ -57,3 +58,22 @@ class InvoiceResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class BulkInvoiceResult(BaseModel):
+    index: int
+    status: str  # "created" or "error"
+    invoice_id: Optional[int] = None
+    invoice_number: Optional[str] = None
+    detail: Optional[str] = None
+
+class BulkInvoiceResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkInvoiceResult]
+
+class PdfExportRequest(BaseModel):
+    shop_id: Optional[int] = None  # super admin only; shop admins get their shop
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    invoice_ids: Optional[List[int]] = None
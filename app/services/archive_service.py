@@ -0,0 +1,249 @@
+import gzip
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.invoice import Invoice, InvoiceItem
+from app.models.invoice_archive import ArchivedInvoice, InvoiceArchiveSegment
+from app.services.loading import INVOICE_PDF
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveIntegrityError(Exception):
+    """An archive segment or record doesn't match its stored checksum."""
+
+
+# 🧊 Record format
+def invoice_record(invoice) -> dict:
+    """Self-contained JSON-able copy of an invoice, its items and the names printed on it."""
+    return {
+        "id": invoice.id,
+        "invoice_number": invoice.invoice_number,
+        "shop_id": invoice.shop_id,
+        "shop_name": invoice.shop.name,
+        "created_by_id": invoice.created_by_id,
+        "created_by_username": invoice.created_by.username,
+        "created_at": invoice.created_at.isoformat(),
+        "updated_at": (invoice.updated_at or invoice.created_at).isoformat(),
+        "customer_name": invoice.customer_name,
+        "customer_email": invoice.customer_email,
+        "sub_total": invoice.sub_total,
+        "discount_type": invoice.discount_type,
+        "discount_value": invoice.discount_value,
+        "discount_amount": invoice.discount_amount,
+        "tax_rate": invoice.tax_rate,
+        "tax_amount": invoice.tax_amount,
+        "grand_total": invoice.grand_total,
+        "payment_method": invoice.payment_method,
+        "payment_status": invoice.payment_status,
+        "items": [
+            {
+                "id": item.id,
+                "product_id": item.product_id,
+                "product_name": item.product.name,
+                "quantity": item.quantity,
+                "price": item.price,
+                "total_price": item.total_price,
+            }
+            for item in sorted(invoice.items, key=lambda item: item.id)
+        ],
+    }
+
+
+def _canonical(record: dict) -> bytes:
+    return json.dumps(record, sort_keys=True, separators=(",", ":")).encode()
+
+
+def record_checksum(record: dict) -> str:
+    return hashlib.sha256(_canonical(record)).hexdigest()
+
+
+def encode_segment(records: list[dict]) -> tuple[bytes, str]:
+    """gzip'd NDJSON payload and its sha256."""
+    payload = gzip.compress(b"\n".join(_canonical(record) for record in records), compresslevel=9)
+    return payload, hashlib.sha256(payload).hexdigest()
+
+
+def decode_segment(segment) -> dict[int, dict]:
+    """invoice id -> record, after checking the payload checksum."""
+    if hashlib.sha256(segment.payload).hexdigest() != segment.checksum:
+        logger.error("Archive segment %s failed checksum verification", segment.id)
+        raise ArchiveIntegrityError(f"Archive segment {segment.id} is corrupt")
+
+    records = [json.loads(line) for line in gzip.decompress(segment.payload).splitlines()]
+    return {record["id"]: record for record in records}
+
+
+def _verified(record: dict | None, index_row) -> dict:
+    if record is None or record_checksum(record) != index_row.checksum:
+        logger.error("Archived invoice %s failed checksum verification", index_row.id)
+        raise ArchiveIntegrityError(f"Archived invoice {index_row.id} is corrupt")
+    created_at = datetime.fromisoformat(record["created_at"])
+    # records archived before invoices had updated_at
+    updated_at = datetime.fromisoformat(record["updated_at"]) if "updated_at" in record else created_at
+    return dict(record, created_at=created_at, updated_at=updated_at)
+
+
+# 📦 Archive job
+def archive_invoices(db: Session, older_than_days: int | None = None, batch_size: int | None = None) -> int:
+    """
+    Move paid invoices older than `older_than_days` out of the hot tables
+    into compressed per-shop, per-month segments, leaving an
+    ArchivedInvoice index row for each.
+
+    Each batch is one transaction: the segment is written, read back and
+    every record's checksum compared with the live rows before those rows
+    are deleted. Returns the number of invoices archived.
+    """
+    older_than_days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archived = 0
+
+    while True:
+        invoices = (
+            db.query(Invoice)
+            .options(*INVOICE_PDF)
+            .filter(Invoice.payment_status == "paid", Invoice.created_at < cutoff)
+            .order_by(Invoice.shop_id, Invoice.created_at, Invoice.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not invoices:
+            break
+
+        groups = {}
+        for invoice in invoices:
+            month = invoice.created_at.date().replace(day=1)
+            groups.setdefault((invoice.shop_id, month), []).append(invoice)
+
+        for (shop_id, month), group in groups.items():
+            records = [invoice_record(invoice) for invoice in group]
+            checksums = {record["id"]: record_checksum(record) for record in records}
+            payload, checksum = encode_segment(records)
+
+            segment = InvoiceArchiveSegment(
+                shop_id=shop_id,
+                month=month,
+                invoice_count=len(records),
+                payload=payload,
+                checksum=checksum
+            )
+            db.add(segment)
+            db.flush()
+
+            db.execute(insert(ArchivedInvoice), [
+                {
+                    "id": invoice.id,
+                    "invoice_number": invoice.invoice_number,
+                    "shop_id": invoice.shop_id,
+                    "created_at": invoice.created_at,
+                    "payment_status": invoice.payment_status,
+                    "grand_total": invoice.grand_total,
+                    "tax_amount": invoice.tax_amount,
+                    "discount_amount": invoice.discount_amount,
+                    "segment_id": segment.id,
+                    "checksum": checksums[invoice.id],
+                }
+                for invoice in group
+            ])
+
+            # 🔍 Read back what was stored and check it against the live rows
+            db.refresh(segment)
+            decoded = decode_segment(segment)
+            if {invoice_id: record_checksum(record) for invoice_id, record in decoded.items()} != checksums:
+                db.rollback()
+                raise ArchiveIntegrityError(f"Archive segment for shop {shop_id}, {month:%Y-%m} did not verify")
+
+        invoice_ids = [invoice.id for invoice in invoices]
+        db.expunge_all()
+
+        # The created_at bound lets a partitioned schema prune to old months
+        db.query(InvoiceItem).filter(
+            InvoiceItem.invoice_id.in_(invoice_ids),
+            InvoiceItem.invoice_created_at < cutoff
+        ).delete(synchronize_session=False)
+        db.query(Invoice).filter(
+            Invoice.id.in_(invoice_ids),
+            Invoice.created_at < cutoff
+        ).delete(synchronize_session=False)
+
+        db.commit()
+        archived += len(invoice_ids)
+        logger.info("Archived %d invoices (%d total)", len(invoice_ids), archived)
+
+    return archived
+
+
+# 📖 Reading the archive
+def iter_archived_records(db: Session, query):
+    """
+    Verified records for the ArchivedInvoice rows selected by `query`,
+    opening each segment once. Records come out grouped by segment.
+    """
+    current_id, current = None, None
+
+    for index_row in query.order_by(ArchivedInvoice.segment_id, ArchivedInvoice.id).yield_per(1000):
+        if index_row.segment_id != current_id:
+            segment = db.get(InvoiceArchiveSegment, index_row.segment_id)
+            current_id, current = index_row.segment_id, decode_segment(segment)
+            db.expunge(segment)
+
+        yield _verified(current.get(index_row.id), index_row)
+
+
+def archived_snapshot(record: dict):
+    """Same shape as pdf_service.invoice_snapshot, built from an archived record."""
+    return SimpleNamespace(
+        id=record["id"],
+        invoice_number=record["invoice_number"],
+        created_at=record["created_at"],
+        updated_at=record["updated_at"],
+        shop_id=record["shop_id"],
+        shop=SimpleNamespace(name=record["shop_name"]),
+        created_by=SimpleNamespace(username=record["created_by_username"]),
+        payment_method=record["payment_method"],
+        payment_status=record["payment_status"],
+        customer_name=record["customer_name"],
+        customer_email=record["customer_email"],
+        items=[
+            SimpleNamespace(
+                id=item["id"],
+                product=SimpleNamespace(name=item["product_name"]),
+                quantity=item["quantity"],
+                price=item["price"],
+                total_price=item["total_price"]
+            )
+            for item in record["items"]
+        ],
+        sub_total=record["sub_total"],
+        tax_rate=record["tax_rate"],
+        tax_amount=record["tax_amount"],
+        discount_amount=record["discount_amount"],
+        grand_total=record["grand_total"]
+    )
+
+
+def load_archived_invoices(db: Session, invoice_ids: list[int]) -> list:
+    """Snapshots of the given invoices that live in the archive (others are skipped)."""
+    if not invoice_ids:
+        return []
+    query = db.query(ArchivedInvoice).filter(ArchivedInvoice.id.in_(invoice_ids))
+    return [archived_snapshot(record) for record in iter_archived_records(db, query)]
+
+
+def load_archived_invoice(db: Session, invoice_id: int):
+    snapshots = load_archived_invoices(db, [invoice_id])
+    return snapshots[0] if snapshots else None
+
+
+def verify_archive(db: Session) -> int:
+    """Re-check every segment and record checksum; returns invoices verified."""
+    return sum(1 for _ in iter_archived_records(db, db.query(ArchivedInvoice)))
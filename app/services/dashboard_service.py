@@ -1,86 +1,70 @@
-from datetime import timedelta, date
+from datetime import datetime, timedelta, date
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, func
 
+from app.core.cache import dashboard_cache
+from app.models.daily_revenue import DailyRevenue
 from app.models.invoice import Invoice
+from app.services.loading import INVOICE_LIST
+from app.utils.pagination import keyset_paginate
 
 
+@dashboard_cache.cached("summary")
 def get_dashboard_summary(db: Session, shop_id: int | None = None):
-    today = date.today()
+    # Served from the (shop_id, day) rollup: one row per day of history
+    today = datetime.utcnow().date()
     start_of_month = today.replace(day=1)
+    start_of_next_month = (start_of_month + timedelta(days=32)).replace(day=1)
 
-    base_query = db.query(Invoice)
-
-    if shop_id:
-        base_query = base_query.filter(Invoice.shop_id == shop_id)
-
-    total_revenue = (
-        base_query.with_entities(func.coalesce(func.sum(Invoice.grand_total), 0))
-        .scalar()
+    is_this_month = and_(
+        DailyRevenue.day >= start_of_month,
+        DailyRevenue.day < start_of_next_month
     )
 
-    today_revenue = (
-        base_query
-        .filter(func.date(Invoice.created_at) == today)
-        .with_entities(func.coalesce(func.sum(Invoice.grand_total), 0))
-        .scalar()
+    query = db.query(
+        func.coalesce(func.sum(DailyRevenue.revenue), 0).label("total_revenue"),
+        func.coalesce(func.sum(DailyRevenue.revenue).filter(DailyRevenue.day == today), 0).label("today_revenue"),
+        func.coalesce(func.sum(DailyRevenue.revenue).filter(is_this_month), 0).label("monthly_revenue"),
+        func.coalesce(func.sum(DailyRevenue.invoice_count), 0).label("total_invoices"),
+        func.coalesce(func.sum(DailyRevenue.paid_count), 0).label("paid_invoices"),
+        func.coalesce(func.sum(DailyRevenue.discount), 0).label("total_discount"),
+        func.coalesce(func.sum(DailyRevenue.tax), 0).label("total_tax"),
     )
 
-    monthly_revenue = (
-        base_query
-        .filter(Invoice.created_at >= start_of_month)
-        .with_entities(func.coalesce(func.sum(Invoice.grand_total), 0))
-        .scalar()
-    )
-
-    total_invoices = base_query.count()
-
-    paid_invoices = base_query.filter(
-        Invoice.payment_status == "paid"
-    ).count()
-
-    pending_invoices = base_query.filter(
-        Invoice.payment_status != "paid"
-    ).count()
-
-    total_discount = (
-        base_query.with_entities(func.coalesce(func.sum(Invoice.discount_amount), 0))
-        .scalar()
-    )
+    if shop_id:
+        query = query.filter(DailyRevenue.shop_id == shop_id)
 
-    total_tax = (
-        base_query.with_entities(func.coalesce(func.sum(Invoice.tax_amount), 0))
-        .scalar()
-    )
+    row = query.one()
 
     return {
-        "total_revenue": float(total_revenue),
-        "today_revenue": float(today_revenue),
-        "monthly_revenue": float(monthly_revenue),
-        "total_invoices": total_invoices,
-        "paid_invoices": paid_invoices,
-        "pending_invoices": pending_invoices,
-        "total_discount": float(total_discount),
-        "total_tax": float(total_tax)
+        "total_revenue": float(row.total_revenue),
+        "today_revenue": float(row.today_revenue),
+        "monthly_revenue": float(row.monthly_revenue),
+        "total_invoices": int(row.total_invoices),
+        "paid_invoices": int(row.paid_invoices),
+        "pending_invoices": int(row.total_invoices - row.paid_invoices),
+        "total_discount": float(row.total_discount),
+        "total_tax": float(row.total_tax)
     }
 
 
 
+@dashboard_cache.cached("daily")
 def get_daily_revenue_chart(db, shop_id: int | None, days: int = 7):
-    start_date = date.today() - timedelta(days=days - 1)
+    start_date = datetime.utcnow().date() - timedelta(days=days - 1)
 
     query = (
         db.query(
-            func.date(Invoice.created_at).label("date"),
-            func.sum(Invoice.grand_total).label("total")
+            DailyRevenue.day.label("date"),
+            func.sum(DailyRevenue.revenue).label("total")
         )
-        .filter(Invoice.created_at >= start_date)
-        .group_by(func.date(Invoice.created_at))
-        .order_by(func.date(Invoice.created_at))
+        .filter(DailyRevenue.day >= start_date)
+        .group_by(DailyRevenue.day)
+        .order_by(DailyRevenue.day)
     )
 
     if shop_id:
-        query = query.filter(Invoice.shop_id == shop_id)
+        query = query.filter(DailyRevenue.shop_id == shop_id)
 
     data = query.all()
 
@@ -90,20 +74,29 @@ def get_daily_revenue_chart(db, shop_id: int | None, days: int = 7):
     ]
 
 
+@dashboard_cache.cached("monthly")
 def get_monthly_revenue_chart(db, shop_id: int | None, months: int = 6):
+    # First day of the oldest month in the window (most recent N months)
+    first_month = datetime.utcnow().date().replace(day=1)
+    for _ in range(max(months, 1) - 1):
+        first_month = (first_month - timedelta(days=1)).replace(day=1)
+
+    month = func.date_trunc("month", DailyRevenue.day)
+
     query = (
         db.query(
-            func.date_trunc("month", Invoice.created_at).label("month"),
-            func.sum(Invoice.grand_total).label("total")
+            month.label("month"),
+            func.sum(DailyRevenue.revenue).label("total")
         )
-        .group_by(func.date_trunc("month", Invoice.created_at))
-        .order_by(func.date_trunc("month", Invoice.created_at))
+        .filter(DailyRevenue.day >= first_month)
+        .group_by(month)
+        .order_by(month)
     )
 
     if shop_id:
-        query = query.filter(Invoice.shop_id == shop_id)
+        query = query.filter(DailyRevenue.shop_id == shop_id)
 
-    data = query.limit(months).all()
+    data = query.all()
 
     return [
         {
@@ -120,10 +113,11 @@ def get_invoice_list(
     status: str | None,
     date_from: date | None,
     date_to: date | None,
-    page: int,
-    limit: int
+    cursor: str | None,
+    limit: int,
+    with_total: bool = False
 ):
-    query = db.query(Invoice)
+    query = db.query(Invoice).options(*INVOICE_LIST)
 
     if shop_id:
         query = query.filter(Invoice.shop_id == shop_id)
@@ -137,18 +131,4 @@ def get_invoice_list(
     if date_to:
         query = query.filter(Invoice.created_at <= date_to)
 
-    total = query.count()
-
-    invoices = (
-        query.order_by(Invoice.created_at.desc())
-        .offset((page - 1) * limit)
-        .limit(limit)
-        .all()
-    )
-
-    return {
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "data": invoices
-    }
+    return keyset_paginate(query, Invoice, cursor, limit, with_total)
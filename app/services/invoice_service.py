@@ -1,35 +1,149 @@
+import threading
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import extract
+from sqlalchemy import Integer, cast, event, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.cache import dashboard_cache
+from app.core.config import settings
 from app.models.invoice import Invoice, InvoiceItem
+from app.models.invoice_sequence import InvoiceSequence
 from app.models.product import Product
+from app.services.revenue_rollup_service import record_invoice_revenue
 
 
 # 🔢 Invoice Number Generator
-def generate_invoice_number(db: Session, shop_id: int) -> str:
-    year = datetime.utcnow().year
-
-    last_invoice = (
-        db.query(Invoice)
-        .filter(
+_seeded_sequences = set()
+_sequence_blocks = {}  # (shop_id, year) -> [[next_value, last_value], ...]
+_sequence_lock = threading.Lock()
+
+
+def _seed_invoice_sequence(db: Session, shop_id: int, year: int):
+    """
+    Create the (shop, year) counter if it's missing, starting after the
+    highest number already issued. Runs in the caller's transaction (no
+    second pooled connection per checkout); the key is only remembered
+    once the row is known to be committed, so a rolled back checkout
+    just seeds again next time.
+    """
+    key = (shop_id, year)
+    if key in _seeded_sequences:
+        return
+
+    last_issued = (
+        select(
+            func.coalesce(
+                func.max(cast(func.split_part(Invoice.invoice_number, "-", 3), Integer)),
+                0
+            )
+        )
+        .where(
             Invoice.shop_id == shop_id,
-            extract("year", Invoice.created_at) == year
+            Invoice.created_at >= datetime(year, 1, 1),
+            Invoice.created_at < datetime(year + 1, 1, 1)
         )
-        .order_by(Invoice.id.desc())
-        .first()
+        .scalar_subquery()
     )
 
-    next_seq = (
-        int(last_invoice.invoice_number.split("-")[-1]) + 1
-        if last_invoice else 1
+    inserted = db.execute(
+        pg_insert(InvoiceSequence)
+        .values(shop_id=shop_id, year=year, last_value=last_issued)
+        .on_conflict_do_nothing(
+            index_elements=[InvoiceSequence.shop_id, InvoiceSequence.year]
+        )
+        .returning(InvoiceSequence.shop_id)
+    ).first()
+
+    # Nothing inserted: the row was already there (committed)
+    if inserted is None:
+        _seeded_sequences.add(key)
+
+
+def _advance_invoice_sequence(conn, shop_id: int, year: int, count: int) -> int:
+    """Atomically reserve `count` numbers and return the last one."""
+    stmt = (
+        pg_insert(InvoiceSequence)
+        .values(shop_id=shop_id, year=year, last_value=count)
+        .on_conflict_do_update(
+            index_elements=[InvoiceSequence.shop_id, InvoiceSequence.year],
+            set_={"last_value": InvoiceSequence.last_value + count}
+        )
+        .returning(InvoiceSequence.last_value)
     )
+    return conn.execute(stmt).scalar_one()
+
+
+def _take_reserved_number(key) -> int | None:
+    """Next number from this worker's reserved blocks, if any are left."""
+    with _sequence_lock:
+        blocks = _sequence_blocks.get(key, [])
+        while blocks:
+            block = blocks[0]
+            if block[0] <= block[1]:
+                block[0] += 1
+                return block[0] - 1
+            blocks.pop(0)
+    return None
+
+
+# A block is reserved in the checkout's own transaction, so it only
+# becomes usable by other checkouts once that transaction commits; on
+# rollback the counter rewinds and the block is forgotten with it.
+@event.listens_for(Session, "after_commit")
+def _publish_reserved_blocks(session):
+    pending = session.info.pop("pending_invoice_blocks", None)
+    if pending:
+        with _sequence_lock:
+            for key, block in pending:
+                _sequence_blocks.setdefault(key, []).append(block)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_reserved_blocks(session):
+    session.info.pop("pending_invoice_blocks", None)
+
+
+def generate_invoice_number(db: Session, shop_id: int) -> str:
+    year = datetime.utcnow().year
+    _seed_invoice_sequence(db, shop_id, year)
+
+    block_size = settings.INVOICE_NUMBER_BLOCK_SIZE
+
+    if block_size <= 1:
+        # Same transaction as the invoice: numbers stay gapless
+        next_seq = _advance_invoice_sequence(db, shop_id, year, 1)
+    else:
+        # Hand out numbers from blocks reserved by this worker. The lock
+        # only guards the in-memory blocks; refills hit the database
+        # outside it, because this also runs on the event loop (run_sync)
+        # where blocking on a lock held across I/O would hang the worker.
+        # Only one checkout in block_size takes the counter row lock.
+        key = (shop_id, year)
+        next_seq = _take_reserved_number(key)
+        if next_seq is None:
+            last_value = _advance_invoice_sequence(db, shop_id, year, block_size)
+            next_seq = last_value - block_size + 1
+            if next_seq < last_value:
+                db.info.setdefault("pending_invoice_blocks", []).append((key, [next_seq + 1, last_value]))
 
     return f"INV-{year}-{next_seq:06d}"
 
 
+def generate_invoice_numbers(db: Session, shop_id: int, count: int) -> list[str]:
+    """Reserve `count` consecutive numbers in the caller's transaction."""
+    year = datetime.utcnow().year
+    _seed_invoice_sequence(db, shop_id, year)
+
+    last_value = _advance_invoice_sequence(db, shop_id, year, count)
+
+    return [
+        f"INV-{year}-{seq:06d}"
+        for seq in range(last_value - count + 1, last_value + 1)
+    ]
+
+
 # 💸 Discount Calculation
 def calculate_discount(
     sub_total: float,
@@ -48,123 +162,314 @@ def calculate_discount(
     return 0.0
 
 
+# 🧮 Totals (discount, tax, grand total) for an invoice header
+def build_invoice_header(invoice_data, sub_total: float) -> dict:
+    # 💸 Discount
+    discount_amount = calculate_discount(
+        sub_total=sub_total,
+        discount_type=invoice_data.discount_type,
+        discount_value=invoice_data.discount_value or 0
+    )
+
+    # 🧾 Tax
+    tax_rate = invoice_data.tax_rate or 0
+    taxable_amount = sub_total - discount_amount
+    tax_amount = (taxable_amount * tax_rate) / 100
+
+    # 💰 Grand Total
+    grand_total = taxable_amount + tax_amount
+
+    return {
+        "customer_name": invoice_data.customer_name,
+        "customer_email": invoice_data.customer_email,
+        "sub_total": sub_total,
+        "discount_type": invoice_data.discount_type,
+        "discount_value": invoice_data.discount_value or 0,
+        "discount_amount": discount_amount,
+        "tax_rate": tax_rate,
+        "tax_amount": tax_amount,
+        "grand_total": grand_total,
+        "payment_method": invoice_data.payment_method,
+        "payment_status": invoice_data.payment_status,
+    }
+
+
+# 🏪 Shop an invoice belongs to
+def resolve_shop_id(invoice_data, current_user) -> int:
+    if "shop_admin" in current_user.roles:
+        return current_user.organization_id
+
+    if not invoice_data.shop_id:
+        raise HTTPException(
+            status_code=400,
+            detail="shop_id is required for super admin"
+        )
+    return invoice_data.shop_id
+
+
+# 🔒 Load & lock all basket products in one round trip
+def load_products_for_update(db: Session, shop_id: int, product_ids) -> dict:
+    """
+    Fetch every product referenced by a basket with a single
+    SELECT ... FOR UPDATE. Rows are locked in primary key order so two
+    concurrent checkouts touching the same products can't deadlock.
+    """
+    products = (
+        db.query(Product)
+        .filter(
+            Product.id.in_(sorted(set(product_ids))),
+            Product.shop_id == shop_id
+        )
+        .order_by(Product.id)
+        .with_for_update()
+        .all()
+    )
+    return {product.id: product for product in products}
+
+
 # 🧠 Create Invoice Logic
 def create_invoice_service(db: Session, invoice_data, current_user):
-    role_names = [role.name for role in current_user.roles]
-
     # 🏪 Determine shop
-    if "shop_admin" in role_names:
-        shop_id = current_user.organization_id
-    else:
-        shop_id = invoice_data.shop_id
-        if not shop_id:
-            raise HTTPException(
-                status_code=400,
-                detail="shop_id is required for super admin"
-            )
-
-    invoice_number = generate_invoice_number(db, shop_id)
+    shop_id = resolve_shop_id(invoice_data, current_user)
 
-    invoice_items_data = []
-    sub_total = 0.0
+    # 📦 Validate products & stock (one query for the whole basket)
+    products = load_products_for_update(
+        db, shop_id, [item.product_id for item in invoice_data.items]
+    )
 
-    # 📦 Validate products & stock
+    requested = {}
     for item in invoice_data.items:
-        product = (
-            db.query(Product)
-            .filter(
-                Product.id == item.product_id,
-                Product.shop_id == shop_id
-            )
-            .first()
-        )
-
-        if not product:
+        if item.product_id not in products:
+            db.rollback()
             raise HTTPException(
                 status_code=404,
                 detail=f"Product {item.product_id} not found"
             )
+        requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
 
-        if product.quantity < item.quantity:
+    for product_id, quantity in requested.items():
+        product = products[product_id]
+        if product.quantity < quantity:
+            db.rollback()
             raise HTTPException(
                 status_code=400,
                 detail=f"Not enough stock for {product.name}"
             )
 
+    invoice_items = []
+    sub_total = 0.0
+    created_at = datetime.utcnow()
+
+    for item in invoice_data.items:
+        product = products[item.product_id]
         total_price = product.price * item.quantity
         sub_total += total_price
 
-        invoice_items_data.append(
-            (product, item.quantity, product.price, total_price)
+        invoice_items.append(
+            InvoiceItem(
+                product_id=product.id,
+                quantity=item.quantity,
+                price=product.price,
+                total_price=total_price,
+                invoice_created_at=created_at
+            )
         )
 
-    # 🧮 Discount
-    discount_amount = calculate_discount(
-        sub_total=sub_total,
-        discount_type=invoice_data.discount_type,
-        discount_value=invoice_data.discount_value or 0
-    )
-
-    # 🧾 Tax
-    tax_rate = invoice_data.tax_rate or 0
-    taxable_amount = sub_total - discount_amount
-    tax_amount = (taxable_amount * tax_rate) / 100
+    try:
+        invoice_number = generate_invoice_number(db, shop_id)
 
-    # 💰 Grand Total
-    grand_total = taxable_amount + tax_amount
+        header = build_invoice_header(invoice_data, sub_total)
+        header.update(
+            shop_id=shop_id,
+            created_by_id=current_user.id,
+            created_at=created_at,
+            updated_at=created_at
+        )
 
-    try:
-        # 🧾 Create Invoice
+        # 🧾 Create Invoice with its items (header + items + stock in one transaction)
         invoice = Invoice(
+            **header,
             invoice_number=invoice_number,
-            customer_name=invoice_data.customer_name,
-            customer_email=invoice_data.customer_email,
-
-            sub_total=sub_total,
+            items=invoice_items
+        )
+        db.add(invoice)
 
-            discount_type=invoice_data.discount_type,
-            discount_value=invoice_data.discount_value or 0,
-            discount_amount=discount_amount,
+        # 📉 Reduce stock
+        for product_id, quantity in requested.items():
+            products[product_id].quantity -= quantity
 
-            tax_rate=tax_rate,
-            tax_amount=tax_amount,
+        # 📊 Dashboard rollup
+        record_invoice_revenue(db, [header])
 
-            grand_total=grand_total,
+        db.commit()
+        dashboard_cache.invalidate(shop_id)
+        db.refresh(invoice)
 
-            payment_method=invoice_data.payment_method,
-            payment_status=invoice_data.payment_status,
+        return invoice
 
-            shop_id=shop_id,
-            created_by_id=current_user.id
+    except SQLAlchemyError:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to create invoice"
         )
 
-        db.add(invoice)
-        db.commit()
-        db.refresh(invoice)
 
-        # 📦 Create Invoice Items & reduce stock
-        for product, quantity, price, total_price in invoice_items_data:
-            db.add(
-                InvoiceItem(
-                    invoice_id=invoice.id,
-                    product_id=product.id,
-                    quantity=quantity,
-                    price=price,
-                    total_price=total_price
-                )
+# 📥 Bulk Invoice Ingestion
+def create_invoices_bulk_service(db: Session, invoices_data: list, current_user) -> list[dict]:
+    """
+    Create many invoices in one transaction.
+
+    Products for every row are loaded and locked with a single query,
+    stock is checked against a running in-memory balance, and headers and
+    items are written with executemany inserts. Rows that fail validation
+    are reported and skipped; the rest are committed together.
+    """
+    results = [None] * len(invoices_data)
+
+    # 🏪 Determine shop for each row
+    shop_ids = {}
+    for index, invoice_data in enumerate(invoices_data):
+        try:
+            shop_ids[index] = resolve_shop_id(invoice_data, current_user)
+        except HTTPException as exc:
+            results[index] = {"index": index, "status": "error", "detail": exc.detail}
+
+    # 📦 Load every referenced product in one round trip
+    product_ids = {
+        item.product_id
+        for index in shop_ids
+        for item in invoices_data[index].items
+    }
+    products = {}
+    if product_ids:
+        products = {
+            product.id: product
+            for product in (
+                db.query(Product)
+                .filter(Product.id.in_(sorted(product_ids)))
+                .order_by(Product.id)
+                .with_for_update()
+                .all()
             )
+        }
+
+    # ✅ Validate rows against a running stock balance
+    remaining = {product_id: product.quantity for product_id, product in products.items()}
+    accepted = []  # (index, header, items)
+    created_at = datetime.utcnow()
+
+    for index, shop_id in shop_ids.items():
+        invoice_data = invoices_data[index]
+
+        requested = {}
+        for item in invoice_data.items:
+            requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
+
+        error = None
+        for product_id, quantity in requested.items():
+            product = products.get(product_id)
+            if not product or product.shop_id != shop_id:
+                error = f"Product {product_id} not found"
+                break
+            if remaining[product_id] < quantity:
+                error = f"Not enough stock for {product.name}"
+                break
+
+        if error:
+            results[index] = {"index": index, "status": "error", "detail": error}
+            continue
+
+        for product_id, quantity in requested.items():
+            remaining[product_id] -= quantity
+
+        items = []
+        sub_total = 0.0
+        for item in invoice_data.items:
+            price = products[item.product_id].price
+            total_price = price * item.quantity
+            sub_total += total_price
+            items.append({
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "price": price,
+                "total_price": total_price,
+            })
+
+        header = build_invoice_header(invoice_data, sub_total)
+        header.update(
+            shop_id=shop_id, created_by_id=current_user.id, created_at=created_at, updated_at=created_at
+        )
+        accepted.append((index, header, items))
 
-            product.quantity -= quantity
-            db.add(product)
+    if not accepted:
+        db.rollback()
+        return results
 
-        db.commit()
-        db.refresh(invoice)
+    try:
+        # 🔢 One counter bump per shop, in shop order so concurrent bulk
+        # requests lock the invoice_sequences rows in the same order
+        numbers_by_shop = {}
+        for _, header, _ in accepted:
+            numbers_by_shop.setdefault(header["shop_id"], 0)
+            numbers_by_shop[header["shop_id"]] += 1
+        for shop_id, count in sorted(numbers_by_shop.items()):
+            numbers_by_shop[shop_id] = iter(generate_invoice_numbers(db, shop_id, count))
+
+        headers = []
+        for _, header, _ in accepted:
+            header["invoice_number"] = next(numbers_by_shop[header["shop_id"]])
+            headers.append(header)
+
+        # 🧾 Headers (executemany with RETURNING, in parameter order)
+        invoice_ids = db.scalars(
+            insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True),
+            headers
+        ).all()
+
+        # 📦 Items
+        item_rows = [
+            dict(item, invoice_id=invoice_id, invoice_created_at=created_at)
+            for invoice_id, (_, _, items) in zip(invoice_ids, accepted)
+            for item in items
+        ]
+        db.execute(insert(InvoiceItem), item_rows)
+
+        # 📉 Reduce stock (flushed as one batched UPDATE)
+        for product_id, quantity in remaining.items():
+            products[product_id].quantity = quantity
+
+        # 📊 Dashboard rollup
+        record_invoice_revenue(db, headers)
 
-        return invoice
+        db.commit()
+        for shop_id in {header["shop_id"] for header in headers}:
+            dashboard_cache.invalidate(shop_id)
 
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(
             status_code=500,
-            detail="Failed to create invoice"
+            detail="Failed to create invoices"
         )
+
+    for invoice_id, header, (index, _, _) in zip(invoice_ids, headers, accepted):
+        results[index] = {
+            "index": index,
+            "status": "created",
+            "invoice_id": invoice_id,
+            "invoice_number": header["invoice_number"],
+        }
+
+    return results
+
+
+# 🕓 PDF versions
+def touch_invoices_with_product(db: Session, product_id: int):
+    """
+    Bump updated_at on every invoice listing the product, whose name is
+    printed on their PDFs. Runs in the caller's transaction.
+    """
+    db.query(Invoice).filter(
+        Invoice.id.in_(select(InvoiceItem.invoice_id).where(InvoiceItem.product_id == product_id))
+    ).update({Invoice.updated_at: datetime.utcnow()}, synchronize_session=False)
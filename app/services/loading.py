@@ -0,0 +1,24 @@
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.invoice import Invoice, InvoiceItem
+
+# Loader options per read path, so serialising a list of invoices (or a
+# PDF) costs a fixed number of queries instead of one per invoice/item.
+
+# InvoiceResponse lists: 1 query for invoices + 1 SELECT ... IN for all items
+INVOICE_LIST = (
+    selectinload(Invoice.items),
+)
+
+# Single PDF download: header only, items are streamed in chunks
+INVOICE_PDF_HEADER = (
+    joinedload(Invoice.shop),
+    joinedload(Invoice.created_by),
+)
+
+# Batch PDF rendering: shop and creator joined in, items + their products batched
+INVOICE_PDF = (
+    joinedload(Invoice.shop),
+    joinedload(Invoice.created_by),
+    selectinload(Invoice.items).joinedload(InvoiceItem.product),
+)
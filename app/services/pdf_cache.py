@@ -0,0 +1,133 @@
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.config import settings
+
+
+class PdfCache:
+    """
+    Size-bounded on-disk cache of rendered invoice PDFs.
+
+    Files are keyed by invoice and version (`<invoice_id>-<version>.pdf`,
+    see `version`): anything that changes what the invoice prints bumps
+    its updated_at and so the key, so stale renders are never served.
+    Older versions of an invoice are removed when a new one is stored;
+    least recently used files are evicted once the cache grows past
+    `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.render_count = 0
+        self.render_seconds = 0.0
+        self._size = None
+        self._lock = threading.Lock()
+        # the route runs on several threadpool workers at once
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def version(invoice) -> str:
+        """The invoice's PDF version, from its updated_at: no items are read."""
+        return (invoice.updated_at or invoice.created_at).strftime("%Y%m%d%H%M%S%f")
+
+    def _path(self, invoice_id: int, version: str) -> Path:
+        return self.directory / f"{invoice_id}-{version}.pdf"
+
+    def _scan(self) -> list[tuple[Path, os.stat_result]]:
+        """Cached files with their stat, skipping any another worker just removed."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.directory.glob("*.pdf"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                pass
+        return entries
+
+    def open_or_render(self, invoice, version: str, render) -> BinaryIO:
+        """
+        The cached PDF as an open file, rendering and storing it on a miss.
+
+        Callers get a handle rather than a path: other workers may evict
+        the file at any moment, and an open file stays readable after
+        it's unlinked.
+        """
+        path = self._path(invoice.id, version)
+
+        try:
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            pass
+        else:
+            with self._stats_lock:
+                self.hits += 1
+            try:
+                os.utime(path)  # mark as recently used
+            except FileNotFoundError:
+                pass
+            return handle
+
+        started = time.perf_counter()
+        buffer = render(invoice)
+        with self._stats_lock:
+            self.misses += 1
+            self.render_seconds += time.perf_counter() - started
+            self.render_count += 1
+
+        return self._store(invoice.id, path, buffer)
+
+    def _store(self, invoice_id: int, path: Path, buffer) -> BinaryIO:
+        with self._lock:
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "wb") as out:
+                shutil.copyfileobj(buffer, out)
+            buffer.close()
+            # opened before it's published, so eviction can't pull it out from under us
+            handle = open(tmp, "rb")
+            os.replace(tmp, path)
+
+            # Other workers share the directory, so size it afresh each time
+            entries = []
+            for entry, stat in self._scan():
+                # drop superseded renders of this invoice
+                if entry != path and entry.name.startswith(f"{invoice_id}-"):
+                    entry.unlink(missing_ok=True)
+                else:
+                    entries.append((entry, stat))
+
+            size = sum(stat.st_size for _, stat in entries)
+            if size > self.max_bytes:
+                for entry, stat in sorted(entries, key=lambda pair: pair[1].st_mtime):
+                    if size <= self.max_bytes:
+                        break
+                    if entry == path:
+                        continue
+                    entry.unlink(missing_ok=True)
+                    size -= stat.st_size
+
+            self._size = size
+            return handle
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+            renders, render_seconds = self.render_count, self.render_seconds
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "renders": renders,
+            "avg_render_ms": (render_seconds / renders * 1000) if renders else 0.0,
+            "size_bytes": self._size or 0,
+        }
+
+
+pdf_cache = PdfCache(settings.PDF_CACHE_DIR, settings.PDF_CACHE_MAX_BYTES)
@@ -0,0 +1,194 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime, time as dt_time, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import read_session
+from app.models.invoice import Invoice
+from app.models.invoice_archive import ArchivedInvoice
+from app.services.archive_service import load_archived_invoices
+from app.services.loading import INVOICE_PDF
+from app.services.pdf_service import generate_invoice_pdf, invoice_snapshot
+
+CHUNK_SIZE = 200
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# export_id -> progress dict (per worker process)
+export_jobs = {}
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn for the same reason as the password pool (see app.core.security)
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PDF_EXPORT_WORKERS or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+def _render(snapshot):
+    with generate_invoice_pdf(snapshot) as buffer:
+        # invoice numbers repeat across shops, so the id keeps names unique
+        return f"{snapshot.invoice_number}-{snapshot.id}.pdf", buffer.read()
+
+
+class _ZipSink:
+    """Write-only file object; zipfile streams into it and we drain it."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def find_invoice_ids(
+    db: Session,
+    shop_id: int | None,
+    date_from: date | None,
+    date_to: date | None,
+    invoice_ids: list[int] | None
+) -> list[int]:
+    """Matching invoice ids, live and archived."""
+    ids = []
+
+    for model in (Invoice, ArchivedInvoice):
+        query = db.query(model.id)
+
+        if shop_id:
+            query = query.filter(model.shop_id == shop_id)
+        if invoice_ids:
+            query = query.filter(model.id.in_(invoice_ids))
+        if date_from:
+            query = query.filter(model.created_at >= datetime.combine(date_from, dt_time.min))
+        if date_to:
+            query = query.filter(model.created_at < datetime.combine(date_to + timedelta(days=1), dt_time.min))
+
+        ids += [row.id for row in query]
+
+    return sorted(ids)
+
+
+def start_export(invoice_ids: list[int], shop_id: int | None, created_by_id: int) -> str:
+    """
+    Register an export job; `shop_id` is the shop it's limited to (None
+    for a cross-shop export) and decides who may read its progress.
+    """
+    # forget exports that finished more than an hour ago
+    cutoff = time.time() - 3600
+    for old_id in [key for key, job in export_jobs.items() if (job["finished_at"] or time.time()) < cutoff]:
+        export_jobs.pop(old_id, None)
+
+    export_id = uuid.uuid4().hex
+    export_jobs[export_id] = {
+        "export_id": export_id,
+        "shop_id": shop_id,
+        "created_by_id": created_by_id,
+        "status": "pending",
+        "total": len(invoice_ids),
+        "done": 0,
+        "started_at": time.time(),
+        "finished_at": None,
+    }
+    return export_id
+
+
+def stream_invoice_zip(export_id: str, invoice_ids: list[int]):
+    """
+    Render invoices in a process pool and yield ZIP bytes as each PDF
+    completes. At most a few chunks are in flight, so memory stays
+    bounded no matter how many invoices are exported.
+    """
+    job = export_jobs[export_id]
+    job["status"] = "running"
+
+    executor = _get_executor()
+    max_in_flight = (settings.PDF_EXPORT_WORKERS or os.cpu_count()) * 4
+
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+    db = read_session()
+    pending = set()
+
+    def collect(block: bool):
+        nonlocal pending
+        done, pending = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            name, data = future.result()
+            archive.writestr(name, data)
+            job["done"] += 1
+
+    try:
+        for start in range(0, len(invoice_ids), CHUNK_SIZE):
+            chunk = invoice_ids[start:start + CHUNK_SIZE]
+            invoices = (
+                db.query(Invoice)
+                .options(*INVOICE_PDF)
+                .filter(Invoice.id.in_(chunk))
+                .all()
+            )
+            snapshots = [invoice_snapshot(invoice) for invoice in invoices]
+
+            # Anything not in the hot tables has been archived
+            live_ids = {invoice.id for invoice in invoices}
+            snapshots += load_archived_invoices(db, [id_ for id_ in chunk if id_ not in live_ids])
+            db.expunge_all()
+
+            for snapshot in snapshots:
+                while len(pending) >= max_in_flight:
+                    collect(block=True)
+                    yield sink.drain()
+                pending.add(executor.submit(_render, snapshot))
+
+            collect(block=False)
+            yield sink.drain()
+
+        while pending:
+            collect(block=True)
+            yield sink.drain()
+
+        archive.close()
+        yield sink.drain()
+        job["status"] = "completed"
+
+    except Exception:
+        job["status"] = "failed"
+        raise
+
+    finally:
+        # Also reached on GeneratorExit when the client disconnects mid-download
+        if job["status"] == "running":
+            job["status"] = "cancelled"
+        for future in pending:
+            future.cancel()
+        job["finished_at"] = time.time()
+        db.close()
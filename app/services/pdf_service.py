@@ -1,10 +1,131 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from io import BytesIO
+from sqlalchemy.orm import Session, selectinload
+from tempfile import SpooledTemporaryFile
+from types import SimpleNamespace
 
-def generate_invoice_pdf(invoice):
-    buffer = BytesIO()
-    pdf = canvas.Canvas(buffer, pagesize=A4)
+from app.models.invoice import InvoiceItem
+
+ROW_HEIGHT = 20
+BOTTOM_MARGIN = 60
+TOTALS_HEIGHT = 90
+ITEM_CHUNK_SIZE = 500
+SPOOL_MAX_BYTES = 4 * 1024 * 1024  # larger PDFs spill to a temp file
+
+
+def invoice_items_query(db: Session, invoice):
+    """
+    An invoice's items. Filtering on the partition key as well as the
+    invoice id lets a partitioned invoice_items table prune to one month.
+    """
+    return db.query(InvoiceItem).filter(
+        InvoiceItem.invoice_id == invoice.id,
+        InvoiceItem.invoice_created_at == invoice.created_at
+    )
+
+
+def iter_invoice_items(db: Session, invoice, chunk_size: int = ITEM_CHUNK_SIZE):
+    """
+    Stream an invoice's items (with products) in chunks, in line order.
+    Products are selectin-loaded once per chunk: a joined eager load
+    can't be combined with yield_per.
+    """
+    return (
+        invoice_items_query(db, invoice)
+        .options(selectinload(InvoiceItem.product))
+        .order_by(InvoiceItem.id)
+        .execution_options(yield_per=chunk_size)
+    )
+
+
+def invoice_snapshot(invoice):
+    """
+    Plain, picklable copy of everything generate_invoice_pdf reads,
+    so invoices can be rendered in worker processes.
+    """
+    return SimpleNamespace(
+        id=invoice.id,
+        invoice_number=invoice.invoice_number,
+        created_at=invoice.created_at,
+        shop=SimpleNamespace(name=invoice.shop.name),
+        created_by=SimpleNamespace(username=invoice.created_by.username),
+        payment_method=invoice.payment_method,
+        payment_status=invoice.payment_status,
+        customer_name=invoice.customer_name,
+        customer_email=invoice.customer_email,
+        items=[
+            SimpleNamespace(
+                product=SimpleNamespace(name=item.product.name),
+                quantity=item.quantity,
+                price=item.price,
+                total_price=item.total_price
+            )
+            for item in invoice.items
+        ],
+        sub_total=invoice.sub_total,
+        tax_rate=invoice.tax_rate,
+        tax_amount=invoice.tax_amount,
+        discount_amount=invoice.discount_amount,
+        grand_total=invoice.grand_total
+    )
+
+
+def _count_pages(item_count: int, first_table_y: float, next_table_y: float) -> int:
+    """Pages needed for `item_count` rows plus the totals block."""
+    capacity = int((first_table_y - BOTTOM_MARGIN) // ROW_HEIGHT)
+    remaining, y, pages = item_count, first_table_y, 1
+
+    while remaining > capacity:
+        remaining -= capacity
+        pages += 1
+        capacity = int((next_table_y - BOTTOM_MARGIN) // ROW_HEIGHT)
+        y = next_table_y
+
+    y -= remaining * ROW_HEIGHT
+    if y - TOTALS_HEIGHT < BOTTOM_MARGIN:
+        pages += 1
+    return pages
+
+
+def _draw_table_header(pdf, y):
+    pdf.setFont("Helvetica", 10)
+    pdf.drawString(50, y, "Product")
+    pdf.drawString(250, y, "Qty")
+    pdf.drawString(300, y, "Price")
+    pdf.drawString(380, y, "Total")
+
+    y -= 15
+    pdf.line(50, y, 500, y)
+    return y
+
+
+def _draw_page_number(pdf, width, page, total_pages):
+    pdf.setFont("Helvetica", 8)
+    pdf.drawRightString(width - 50, 30, f"Page {page} of {total_pages}")
+
+
+def generate_invoice_pdf(invoice, items=None, item_count=None):
+    """
+    Render an invoice across as many pages as it needs, repeating the
+    table header on every page and printing totals on the last one.
+
+    `items` may be any iterable (e.g. iter_invoice_items) so large
+    invoices are drawn without loading every line up front. ReportLab
+    keeps finished pages in memory until save(); they're compressed, so
+    that costs roughly 0.4 KB per line (about 20 MB at 50,000 lines)
+    rather than a copy of every item. The output spools to disk past
+    SPOOL_MAX_BYTES.
+    """
+    if items is None:
+        items = invoice.items
+    if item_count is None:
+        item_count = len(items)
+
+    # ReportLab is only imported on first render; it's heavy and most
+    # workers never draw a PDF.
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    pdf = canvas.Canvas(buffer, pagesize=A4, pageCompression=1)
     width, height = A4
 
     y = height - 50
@@ -39,23 +160,33 @@ def generate_invoice_pdf(invoice):
     y -= 40
     pdf.drawString(50, y, "Items:")
     y -= 20
-    pdf.drawString(50, y, "Product")
-    pdf.drawString(250, y, "Qty")
-    pdf.drawString(300, y, "Price")
-    pdf.drawString(380, y, "Total")
+    y = _draw_table_header(pdf, y)
 
-    y -= 15
-    pdf.line(50, y, 500, y)
+    total_pages = _count_pages(item_count, y, height - 50 - 15)
+    page = 1
 
     # Items
-    for item in invoice.items:
-        y -= 20
+    for item in items:
+        if y - ROW_HEIGHT < BOTTOM_MARGIN:
+            _draw_page_number(pdf, width, page, total_pages)
+            pdf.showPage()
+            page += 1
+            y = _draw_table_header(pdf, height - 50)
+
+        y -= ROW_HEIGHT
+        pdf.setFont("Helvetica", 10)
         pdf.drawString(50, y, item.product.name)
         pdf.drawString(250, y, str(item.quantity))
         pdf.drawString(300, y, f"{item.price:.2f}")
         pdf.drawString(380, y, f"{item.total_price:.2f}")
 
-    # Totals Section
+    # Totals Section (moved to a fresh page if it doesn't fit)
+    if y - TOTALS_HEIGHT < BOTTOM_MARGIN:
+        _draw_page_number(pdf, width, page, total_pages)
+        pdf.showPage()
+        page += 1
+        y = height - 50
+
     y -= 40
     pdf.setFont("Helvetica-Bold", 10)
     pdf.drawString(300, y, f"Sub Total: {invoice.sub_total:.2f}")
@@ -70,6 +201,7 @@ def generate_invoice_pdf(invoice):
     pdf.setFont("Helvetica-Bold", 12)
     pdf.drawString(300, y, f"Grand Total: {invoice.grand_total:.2f}")
 
+    _draw_page_number(pdf, width, page, total_pages)
     pdf.showPage()
     pdf.save()
 
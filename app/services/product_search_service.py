@@ -0,0 +1,74 @@
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.product import Product
+
+# Must match the expression indexed by migration m0005 exactly; written
+# out literally so no bind parameters end up inside it
+SEARCH_TEXT = literal_column("lower(products.name || ' ' || coalesce(products.description, ''))")
+
+# Trigrams need at least this many characters to say anything useful
+FUZZY_MIN_LENGTH = 3
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_products(
+    db: Session,
+    shop_id: int,
+    q: str,
+    limit: int = 10,
+    active_only: bool = True,
+    in_stock: bool = False
+) -> list[Product]:
+    """
+    Top `limit` products of a shop for a type-ahead query.
+
+    Name prefix matches come first, alphabetically (btree range scan).
+    If that leaves room, fuzzy matches over name and description fill it,
+    nearest first (trigram word similarity, GiST KNN scan).
+    """
+    term = q.strip().lower()
+    if not term:
+        return []
+
+    def scoped(query):
+        query = query.filter(Product.shop_id == shop_id)
+        if active_only:
+            query = query.filter(Product.is_active.is_(True))
+        if in_stock:
+            query = query.filter(Product.quantity > 0)
+        return query
+
+    # C collation: the same index serves the LIKE prefix and the ordering
+    name = func.lower(Product.name).collate("C")
+    results = (
+        scoped(db.query(Product))
+        .filter(name.like(_escape_like(term) + "%"))
+        .order_by(name, Product.id)
+        .limit(limit)
+        .all()
+    )
+
+    if len(results) < limit and len(term) >= FUZZY_MIN_LENGTH:
+        # pg_trgm's default word-similarity cut-off (0.6) drops most typos
+        db.execute(select(func.set_config(
+            "pg_trgm.word_similarity_threshold", str(settings.PRODUCT_SEARCH_FUZZY_THRESHOLD), True
+        )))
+
+        # `text %> query` / `text <->> query`: the indexed side goes on the
+        # left so the GiST index can filter and order
+        query = (
+            scoped(db.query(Product))
+            .filter(SEARCH_TEXT.op("%>")(term))
+            .order_by(SEARCH_TEXT.op("<->>")(term), Product.id)
+            .limit(limit - len(results))
+        )
+        if results:
+            query = query.filter(Product.id.notin_([product.id for product in results]))
+        results += query.all()
+
+    return results
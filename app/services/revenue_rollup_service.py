@@ -0,0 +1,92 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, func, insert, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models.daily_revenue import DailyRevenue
+from app.models.invoice import Invoice
+from app.models.invoice_archive import ArchivedInvoice
+
+
+# ➕ Fold new invoices into the rollup (caller commits)
+def record_invoice_revenue(db: Session, headers: list[dict]):
+    """
+    `headers` are invoice header dicts (shop_id, created_at, grand_total,
+    tax_amount, discount_amount, payment_status). Rows are summed per
+    (shop, day) and upserted with one executemany statement.
+    """
+    buckets = {}
+    for header in headers:
+        key = (header["shop_id"], header["created_at"].date())
+        bucket = buckets.setdefault(key, {
+            "shop_id": key[0],
+            "day": key[1],
+            "revenue": 0.0,
+            "tax": 0.0,
+            "discount": 0.0,
+            "invoice_count": 0,
+            "paid_count": 0,
+        })
+        bucket["revenue"] += header["grand_total"]
+        bucket["tax"] += header["tax_amount"]
+        bucket["discount"] += header["discount_amount"]
+        bucket["invoice_count"] += 1
+        bucket["paid_count"] += 1 if header["payment_status"] == "paid" else 0
+
+    if not buckets:
+        return
+
+    stmt = pg_insert(DailyRevenue)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyRevenue.shop_id, DailyRevenue.day],
+        set_={
+            "revenue": DailyRevenue.revenue + stmt.excluded.revenue,
+            "tax": DailyRevenue.tax + stmt.excluded.tax,
+            "discount": DailyRevenue.discount + stmt.excluded.discount,
+            "invoice_count": DailyRevenue.invoice_count + stmt.excluded.invoice_count,
+            "paid_count": DailyRevenue.paid_count + stmt.excluded.paid_count,
+        }
+    )
+    db.execute(stmt, list(buckets.values()))
+
+
+# 🔁 Rebuild / backfill from the invoices table (and the archive's index rows)
+def rebuild_daily_revenue(db: Session, shop_id: int | None = None) -> int:
+    selects = []
+    for model in (Invoice, ArchivedInvoice):
+        stmt = select(
+            model.shop_id, model.created_at, model.grand_total, model.tax_amount,
+            model.discount_amount, model.payment_status, model.id
+        )
+        if shop_id:
+            stmt = stmt.where(model.shop_id == shop_id)
+        selects.append(stmt)
+
+    invoices = union_all(*selects).subquery()
+    day = func.date(invoices.c.created_at)
+
+    source = (
+        select(
+            invoices.c.shop_id,
+            day,
+            func.coalesce(func.sum(invoices.c.grand_total), 0),
+            func.coalesce(func.sum(invoices.c.tax_amount), 0),
+            func.coalesce(func.sum(invoices.c.discount_amount), 0),
+            func.count(invoices.c.id),
+            func.sum(case((invoices.c.payment_status == "paid", 1), else_=0)),
+        )
+        .group_by(invoices.c.shop_id, day)
+    )
+    clear = delete(DailyRevenue)
+
+    if shop_id:
+        clear = clear.where(DailyRevenue.shop_id == shop_id)
+
+    db.execute(clear)
+    result = db.execute(
+        insert(DailyRevenue).from_select(
+            ["shop_id", "day", "revenue", "tax", "discount", "invoice_count", "paid_count"],
+            source
+        )
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,38 @@
+# app/utils/archive_invoices.py
+#
+# Move old paid invoices to cold storage (cron-friendly):
+#   python -m app.utils.archive_invoices [older_than_days]
+#   python -m app.utils.archive_invoices --verify
+
+import sys
+from datetime import datetime, timedelta
+
+from app import models  # noqa: F401 - configure every mapper
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+from app.db.partitioning import drop_empty_partitions
+from app.services.archive_service import archive_invoices, verify_archive
+
+
+def main():
+    db = SessionLocal()
+    try:
+        if sys.argv[1:] == ["--verify"]:
+            count = verify_archive(db)
+            print(f"🔍 Verified {count} archived invoices")
+            return
+
+        older_than_days = int(sys.argv[1]) if len(sys.argv) > 1 else settings.ARCHIVE_AFTER_DAYS
+        count = archive_invoices(db, older_than_days)
+        print(f"🧊 Archived {count} invoices older than {older_than_days} days")
+    finally:
+        db.close()
+
+    # Partitioned schema: months emptied by the archive can go entirely
+    dropped = drop_empty_partitions(engine, datetime.utcnow().date() - timedelta(days=older_than_days))
+    if dropped:
+        print(f"🗑️ Dropped {len(dropped)} empty partitions")
+
+
+if __name__ == "__main__":
+    main()
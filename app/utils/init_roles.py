@@ -1,20 +1,28 @@
+import logging
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.models.role import Role
 
+logger = logging.getLogger(__name__)
+
+INITIAL_ROLES = [
+    {"name": "super_admin", "description": "Full system access"},
+    {"name": "shop_admin", "description": "Access only for their shop"}
+]
+
+
 def create_initial_roles(db: Session):
     """
     Create initial roles if they do not exist.
     Roles: Super Admin, Shop Admin
-    """
-    roles = [
-        {"name": "super_admin", "description": "Full system access"},
-        {"name": "shop_admin", "description": "Access only for their shop"}
-    ]
 
-    for role_data in roles:
-        role = db.query(Role).filter(Role.name == role_data["name"]).first()
-        if not role:
-            role = Role(**role_data)
-            db.add(role)
+    One INSERT ... ON CONFLICT DO NOTHING, so concurrent callers can't
+    trip over the unique constraint on roles.name.
+    """
+    db.execute(
+        pg_insert(Role)
+        .values(INITIAL_ROLES)
+        .on_conflict_do_nothing(index_elements=[Role.name])
+    )
     db.commit()
-    print("Initial roles created (if not existed).")
+    logger.info("Initial roles created (if not existed).")
@@ -1,34 +1,72 @@
+import logging
+from datetime import datetime
+from sqlalchemy import exists, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from app.models.association import user_roles
 from app.models.user import User
 from app.models.role import Role
-from passlib.context import CryptContext
+from app.core.security import pwd_context
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+def _role_link(user_id: int, role_id: int):
+    return exists().where(user_roles.c.user_id == user_id, user_roles.c.role_id == role_id)
 
 def create_super_admin(db: Session, username: str, email: str, password: str):
     """
-    Creates a Super Admin user with given credentials
+    Creates a Super Admin user with given credentials.
+
+    The lookup comes first so the bcrypt hash is only paid on the very
+    first boot. The account is found by email; one holding the username
+    under another email is only taken as the Super Admin if it already
+    has the role (the configured email changed), never promoted. The
+    insert skips conflicts on either unique column, and the role link is
+    re-added on every boot if it's missing, so reruns repair rather than fail.
     """
-    user = db.query(User).filter(User.email == email).first()
-    if user:
-        print("Super Admin already exists")
-        return user
-
-    # hashed_password = pwd_context.hash(password)
-    hashed_password = pwd_context.hash(password[:72])
-    super_admin_role = db.query(Role).filter(Role.name == "super_admin").first()
-    if not super_admin_role:
+    super_admin_role_id = db.query(Role.id).filter(Role.name == "super_admin").scalar()
+    if super_admin_role_id is None:
         raise Exception("Super Admin role does not exist. Run init_roles first.")
 
-    user = User(
-        username=username,
-        email=email,
-        hashed_password=hashed_password,
-        organization_id=None  # Super Admin is global
+    user_id = db.query(User.id).filter(User.email == email).scalar()
+    if user_id is None:
+        user_id = db.query(User.id).filter(User.username == username).scalar()
+        if user_id is not None:
+            if not db.query(_role_link(user_id, super_admin_role_id)).scalar():
+                logger.error("Username '%s' belongs to another account; Super Admin not created", username)
+                return None
+            logger.warning("Super Admin '%s' is registered under another email than %s", username, email)
+
+    if user_id is None:
+        now = datetime.utcnow()
+        db.execute(
+            pg_insert(User)
+            .values(
+                username=username,
+                email=email,
+                hashed_password=pwd_context.hash(password[:72]),
+                is_active=True,
+                organization_id=None,  # Super Admin is global
+                created_at=now,
+                updated_at=now
+            )
+            .on_conflict_do_nothing()
+        )
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+        if user_id is None:
+            db.rollback()
+            logger.error("Username '%s' was taken meanwhile; Super Admin not created", username)
+            return None
+        logger.info("Super Admin created.")
+    else:
+        logger.info("Super Admin already exists")
+
+    db.execute(
+        user_roles.insert().from_select(
+            ["user_id", "role_id"],
+            select(literal(user_id), literal(super_admin_role_id)).where(~_role_link(user_id, super_admin_role_id))
+        )
     )
-    user.roles.append(super_admin_role)
-    db.add(user)
     db.commit()
-    db.refresh(user)
-    print("Super Admin created.")
-    return user
+
+    return db.get(User, user_id)
@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def encode_cursor(created_at: datetime, row_id: int, direction: str) -> str:
+    raw = json.dumps([direction, created_at.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_paginate(query, model, cursor: str | None, limit: int, with_total: bool = False):
+    """
+    Page `query` newest first on (created_at, id) using an opaque cursor.
+    Every page is a bounded index range scan, no matter how deep it is.
+    The exact total is only counted when asked for.
+
+    The cursor is also applied as a plain created_at bound: Postgres
+    can't prune partitions from the row comparison alone.
+    """
+    key = tuple_(model.created_at, model.id)
+    total = query.order_by(None).count() if with_total else None
+
+    direction = None
+    if cursor:
+        direction, created_at, row_id = decode_cursor(cursor)
+
+    if direction == "prev":
+        rows = (
+            query.filter(model.created_at >= created_at, key > tuple_(created_at, row_id))
+            .order_by(model.created_at.asc(), model.id.asc())
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
+        prev_cursor = encode_cursor(rows[0].created_at, rows[0].id, "prev") if has_more and rows else None
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id, "next") if rows else None
+    else:
+        if direction == "next":
+            query = query.filter(model.created_at <= created_at, key < tuple_(created_at, row_id))
+        rows = (
+            query.order_by(model.created_at.desc(), model.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id, "next") if has_more else None
+        prev_cursor = encode_cursor(rows[0].created_at, rows[0].id, "prev") if direction and rows else None
+
+    return {
+        "data": rows,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "total": total
+    }
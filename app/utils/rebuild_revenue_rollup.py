@@ -0,0 +1,25 @@
+# app/utils/rebuild_revenue_rollup.py
+#
+# Backfill the daily_revenue rollup from invoices:
+#   python -m app.utils.rebuild_revenue_rollup [shop_id]
+
+import sys
+
+from app import models  # noqa: F401 - configure every mapper
+from app.db.database import SessionLocal
+from app.services.revenue_rollup_service import rebuild_daily_revenue
+
+
+def main():
+    shop_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_daily_revenue(db, shop_id)
+        print(f"📊 Rebuilt {rows} daily revenue rows" + (f" for shop {shop_id}" if shop_id else ""))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,65 @@
 # app/utils/startup.py
 
-from app.db.database import SessionLocal
+import logging
+from contextlib import contextmanager
+from app import models  # noqa: F401 - every mapper configured, whatever the entry point
+from app.db.database import SessionLocal, engine
+from app.db.migrations import run_migrations
+from app.db.partitioning import bootstrap_partitions
 from app.utils.init_roles import create_initial_roles
 from app.utils.init_super_admin import create_super_admin
 from app.core.config import settings  
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key for pg_advisory_lock
+BOOTSTRAP_LOCK_KEY = 7_340_911_022
+
+
+@contextmanager
+def bootstrap_lock():
+    """
+    Session-level Postgres advisory lock held on a dedicated connection,
+    so only one worker runs the bootstrap at a time. The others block
+    here and then find nothing left to do.
+    """
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+            conn.commit()
+
+
+def bootstrap():
+    """
+    One-time, cross-worker startup work: apply schema migrations (and
+    invoice partitions, if enabled), then seed roles and the Super Admin. Safe to call from every worker.
+    """
+    with bootstrap_lock():
+        applied = run_migrations(engine)
+        logger.info("Schema migrations applied: %s", ", ".join(applied) or "none pending")
+        if settings.INVOICE_PARTITIONING:
+            bootstrap_partitions(engine)
+        init_system()
+
+
 def init_system():
     """
     Initialize the system at app startup:
     - Create initial roles if not exist
     - Create Super Admin user if not exist
     """
-    print("🚀 Starting system initialization...")
+    logger.info("Starting system initialization...")
 
     db = SessionLocal()
     try:
         # Create roles
         create_initial_roles(db)
-        print("✅ Initial roles checked/created")
+        logger.info("Initial roles checked/created")
 
         # Create Super Admin
         create_super_admin(
@@ -25,11 +68,10 @@ def init_system():
             email=settings.SUPERADMIN_EMAIL,
             password=settings.SUPERADMIN_PASSWORD
         )
-        print("✅ Super Admin checked/created")
+        logger.info("Super Admin checked/created")
 
     except Exception as e:
-        print(f"❌ Error during system initialization: {e}")
+        logger.exception("Error during system initialization: %s", e)
     finally:
         db.close()
-        print("🔒 Database session closed")
-        print("🎉 System initialization complete!")
+        logger.info("System initialization complete")
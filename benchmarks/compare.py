@@ -0,0 +1,40 @@
+# benchmarks/compare.py
+#
+# Diff two harness results:  python -m benchmarks.compare before.json after.json
+
+import json
+import sys
+
+METRICS = ("throughput_rps", "rows_per_s", "p50_ms", "p95_ms", "p99_ms", "queries_per_request", "errors")
+
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m benchmarks.compare BEFORE.json AFTER.json")
+
+    with open(sys.argv[1]) as fh:
+        before = json.load(fh)
+    with open(sys.argv[2]) as fh:
+        after = json.load(fh)
+
+    print(f"before: {before['meta'].get('git_commit')}  after: {after['meta'].get('git_commit')}")
+
+    sections = [("overall", before["overall"], after["overall"])]
+    for name in sorted(set(before["scenarios"]) | set(after["scenarios"])):
+        sections.append((name, before["scenarios"].get(name, {}), after["scenarios"].get(name, {})))
+
+    for name, old, new in sections:
+        print(f"\n{name}")
+        for metric in METRICS:
+            old_value, new_value = old.get(metric), new.get(metric)
+            if old_value is None or new_value is None:
+                change = ""
+            elif old_value:
+                change = f"{(new_value - old_value) / old_value * 100:+.1f}%"
+            else:
+                change = "n/a"
+            print(f"  {metric:<22}{old_value!s:>12}{new_value!s:>12}  {change}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# benchmarks/dashboard.py
+#
+# Dashboard summary before and after: query count and latency of
+#
+#   eight_queries     the original summary, one aggregate per figure over
+#                     invoices, with func.date(created_at) == today
+#   single_aggregate  one FILTER (WHERE ...) aggregate over invoices with
+#                     half-open date ranges
+#   rollup            the current get_dashboard_summary, over daily_revenue
+#
+#   python -m benchmarks.dashboard --rows 1000000 --output dashboard.json
+#
+# History is loaded into the "bench-history" shop the same way as
+# benchmarks.partitions (and shared with it), then the shop's rollup rows
+# are rebuilt. The summary cache is bypassed, so every run hits the database.
+
+import argparse
+import json
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+
+from sqlalchemy import and_, func
+
+from app.core.query_debug import record_queries
+from app.db.database import SessionLocal
+from app.models.invoice import Invoice
+from app.services.dashboard_service import get_dashboard_summary
+from app.services.revenue_rollup_service import rebuild_daily_revenue
+from app.utils.startup import bootstrap
+from benchmarks.partitions import history_fixtures, load_history
+from benchmarks.run import git_commit, summarise
+
+
+def eight_queries(db, shop_id: int) -> dict:
+    """The summary as it was first written: eight full aggregates."""
+    today = date.today()
+    start_of_month = today.replace(day=1)
+    base_query = db.query(Invoice).filter(Invoice.shop_id == shop_id)
+
+    def total(column, *criteria):
+        return base_query.filter(*criteria).with_entities(func.coalesce(func.sum(column), 0)).scalar()
+
+    return {
+        "total_revenue": float(total(Invoice.grand_total)),
+        "today_revenue": float(total(Invoice.grand_total, func.date(Invoice.created_at) == today)),
+        "monthly_revenue": float(total(Invoice.grand_total, Invoice.created_at >= start_of_month)),
+        "total_invoices": base_query.count(),
+        "paid_invoices": base_query.filter(Invoice.payment_status == "paid").count(),
+        "pending_invoices": base_query.filter(Invoice.payment_status != "paid").count(),
+        "total_discount": float(total(Invoice.discount_amount)),
+        "total_tax": float(total(Invoice.tax_amount)),
+    }
+
+
+def single_aggregate(db, shop_id: int) -> dict:
+    """One pass over the shop's invoices with conditional aggregates."""
+    start_of_today = datetime.combine(date.today(), dt_time.min)
+    start_of_month = start_of_today.replace(day=1)
+    start_of_next_month = (start_of_month + timedelta(days=32)).replace(day=1)
+
+    is_today = and_(Invoice.created_at >= start_of_today, Invoice.created_at < start_of_today + timedelta(days=1))
+    is_this_month = and_(Invoice.created_at >= start_of_month, Invoice.created_at < start_of_next_month)
+
+    row = db.query(
+        func.coalesce(func.sum(Invoice.grand_total), 0).label("total_revenue"),
+        func.coalesce(func.sum(Invoice.grand_total).filter(is_today), 0).label("today_revenue"),
+        func.coalesce(func.sum(Invoice.grand_total).filter(is_this_month), 0).label("monthly_revenue"),
+        func.count(Invoice.id).label("total_invoices"),
+        func.count(Invoice.id).filter(Invoice.payment_status == "paid").label("paid_invoices"),
+        func.count(Invoice.id).filter(Invoice.payment_status != "paid").label("pending_invoices"),
+        func.coalesce(func.sum(Invoice.discount_amount), 0).label("total_discount"),
+        func.coalesce(func.sum(Invoice.tax_amount), 0).label("total_tax"),
+    ).filter(Invoice.shop_id == shop_id).one()
+
+    return {
+        "total_revenue": float(row.total_revenue),
+        "today_revenue": float(row.today_revenue),
+        "monthly_revenue": float(row.monthly_revenue),
+        "total_invoices": row.total_invoices,
+        "paid_invoices": row.paid_invoices,
+        "pending_invoices": row.pending_invoices,
+        "total_discount": float(row.total_discount),
+        "total_tax": float(row.total_tax),
+    }
+
+
+VARIANTS = {
+    "eight_queries": eight_queries,
+    "single_aggregate": single_aggregate,
+    "rollup": get_dashboard_summary.compute,  # bypass the dashboard cache
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InvoiceHub dashboard summary benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="historical invoices to load")
+    parser.add_argument("--months", type=int, default=24, help="history span")
+    parser.add_argument("--iterations", type=int, default=20, help="runs per variant")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    bootstrap()
+
+    db = SessionLocal()
+    try:
+        shop_id, product_id, user_id = history_fixtures(db)
+        loaded = load_history(shop_id, product_id, user_id, args.rows, args.months)
+        # the bulk load writes invoices directly, so bring the rollup up to date
+        rebuild_daily_revenue(db, shop_id)
+    finally:
+        db.close()
+
+    summaries = {}
+    variants = {}
+    for name, variant in VARIANTS.items():
+        samples = []
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            db = SessionLocal()
+            try:
+                with record_queries() as statements:
+                    begun = time.perf_counter()
+                    summaries[name] = variant(db, shop_id)
+                    samples.append((name, time.perf_counter() - begun, 200, len(statements)))
+            finally:
+                db.close()
+        variants[name] = summarise(samples, time.perf_counter() - started)
+
+    result = {
+        "meta": {
+            "git_commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "history_rows": loaded,
+            "history_months": args.months,
+            "iterations": args.iterations,
+            # the same figures whichever way they're computed
+            "summaries_match": all(
+                summary["total_invoices"] == summaries["rollup"]["total_invoices"]
+                and round(summary["total_revenue"], 2) == round(summaries["rollup"]["total_revenue"], 2)
+                for summary in summaries.values()
+            ),
+        },
+        "variants": variants,
+    }
+
+    output = json.dumps(result, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/logging_overhead.py
+#
+# Request-path cost of logging: runs the in-process harness once per
+# logging mode, each in a fresh interpreter, and reports latency and
+# throughput against the run with logging off.
+#
+#   python -m benchmarks.logging_overhead --duration 30 --concurrency 50 --output logging.json
+#
+# Modes:
+#   queue   - the default: records are enqueued and written by the listener thread
+#   direct  - LOG_QUEUE=false: records are formatted and written on the request path
+#   off     - LOG_LEVEL=CRITICAL: access records are dropped at the logger
+#
+# Log output goes to /dev/null so terminal speed doesn't skew the numbers.
+# Every other argument is passed through to benchmarks.run.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from benchmarks.run import git_commit
+
+MODES = {
+    "queue": {"LOG_QUEUE": "true", "LOG_LEVEL": "INFO", "LOG_SAMPLE_RATE": "1.0"},
+    "direct": {"LOG_QUEUE": "false", "LOG_LEVEL": "INFO", "LOG_SAMPLE_RATE": "1.0"},
+    "off": {"LOG_LEVEL": "CRITICAL"},
+}
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def run_mode(mode: str, harness_args: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, f"{mode}.json")
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", *harness_args, "--output", output],
+            env={**os.environ, **MODES[mode]},
+            stdout=subprocess.DEVNULL,
+            check=True
+        )
+        with open(output) as fh:
+            return json.load(fh)["overall"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InvoiceHub logging overhead benchmark")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    args, harness_args = parser.parse_known_args()
+
+    results = {mode: run_mode(mode, harness_args) for mode in args.modes}
+
+    overhead = {}
+    baseline = results.get("off")
+    if baseline:
+        for mode, overall in results.items():
+            if mode == "off":
+                continue
+            overhead[mode] = {
+                metric: f"{(overall[metric] - baseline[metric]) / baseline[metric] * 100:+.1f}%"
+                for metric in METRICS
+                if baseline[metric]
+            }
+
+    result = {
+        "meta": {
+            "git_commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "harness_args": harness_args,
+        },
+        "modes": results,
+        "overhead_vs_off": overhead,
+    }
+
+    output = json.dumps(result, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
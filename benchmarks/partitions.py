@@ -0,0 +1,202 @@
+# benchmarks/partitions.py
+#
+# Recent-window invoice queries against a large history, to compare the
+# plain and the partitioned schema (INVOICE_PARTITIONING):
+#
+#   python -m benchmarks.partitions --rows 50000000 --output plain.json
+#   python -m app.db.partitioning convert
+#   python -m benchmarks.partitions --output partitioned.json
+#   python -m benchmarks.compare plain.json partitioned.json
+#
+# History is generated server side (generate_series) into a dedicated
+# "bench-history" shop, spread evenly over --months, one item per invoice.
+# Loading is skipped once the shop already has --rows invoices.
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+from app.db.partitioning import create_partitions, is_partitioned, months_between
+from app.models.invoice import Invoice
+from app.models.organization import Organization
+from app.models.product import Product
+from app.models.user import User
+from app.services.dashboard_service import get_invoice_list
+from app.services.pdf_service import invoice_items_query
+from app.utils.startup import bootstrap
+from benchmarks.run import git_commit, summarise
+
+HISTORY_SHOP = "bench-history"
+BATCH_SIZE = 1_000_000
+
+LOAD_BATCH = text("""
+WITH inserted AS (
+    INSERT INTO invoices (
+        invoice_number, customer_name, sub_total, tax_rate, tax_amount, discount_value,
+        discount_amount, grand_total, payment_status, shop_id, created_by_id, created_at
+    )
+    SELECT
+        'INV-' || extract(year FROM ts)::int || '-' || lpad(g::text, 9, '0'),
+        'Historical customer', 100, 0, 0, 0, 0, 100,
+        CASE WHEN g % 3 = 0 THEN 'pending' ELSE 'paid' END,
+        :shop_id, :user_id, ts
+    FROM generate_series(:start, :stop) AS g,
+         LATERAL (SELECT CAST(:first AS timestamp) + g * CAST(:step AS interval) AS ts) AS t
+    RETURNING id, created_at
+)
+INSERT INTO invoice_items (invoice_id, product_id, quantity, price, total_price, invoice_created_at)
+SELECT id, :product_id, 1, 100, 100, created_at FROM inserted
+""")
+
+
+def history_fixtures(db) -> tuple[int, int, int]:
+    """(shop_id, product_id, created_by_id) for the history shop."""
+    shop = db.query(Organization).filter(Organization.name == HISTORY_SHOP).first()
+    if not shop:
+        shop = Organization(name=HISTORY_SHOP)
+        db.add(shop)
+        db.flush()
+
+    product = db.query(Product).filter(Product.shop_id == shop.id).first()
+    if not product:
+        product = Product(name="History product", price=100, quantity=0, shop_id=shop.id)
+        db.add(product)
+
+    user_id = db.query(User.id).filter(User.email == settings.SUPERADMIN_EMAIL).scalar()
+    db.commit()
+    return shop.id, product.id, user_id
+
+
+def load_history(shop_id: int, product_id: int, user_id: int, rows: int, months: int):
+    with engine.connect() as conn:
+        existing = conn.execute(
+            text("SELECT count(*) FROM invoices WHERE shop_id = :shop_id"), {"shop_id": shop_id}
+        ).scalar()
+    if existing >= rows:
+        return existing
+
+    now = datetime.utcnow()
+    first = now - timedelta(days=30 * months)
+    step = (now - first) / rows
+
+    if settings.INVOICE_PARTITIONING:
+        with engine.begin() as conn:
+            for table in ("invoices", "invoice_items"):
+                if is_partitioned(conn, table):
+                    create_partitions(conn, table, months_between(first.date(), now.date()))
+
+    for start in range(existing + 1, rows + 1, BATCH_SIZE):
+        stop = min(start + BATCH_SIZE - 1, rows)
+        with engine.begin() as conn:
+            conn.execute(LOAD_BATCH, {
+                "shop_id": shop_id,
+                "product_id": product_id,
+                "user_id": user_id,
+                "start": start,
+                "stop": stop,
+                "first": first,
+                "step": step,
+            })
+        print(f"loaded {stop}/{rows} invoices")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE invoices"))
+        conn.execute(text("ANALYZE invoice_items"))
+    return rows
+
+
+def scenarios(shop_id: int) -> dict:
+    today = datetime.utcnow().date()
+
+    def last_7_days(db):
+        return get_invoice_list(db, shop_id, None, today - timedelta(days=6), None, None, 50)
+
+    def paid_last_30_days(db):
+        return get_invoice_list(db, shop_id, "paid", today - timedelta(days=29), None, None, 50)
+
+    def second_page(db):
+        page = get_invoice_list(db, shop_id, None, None, None, None, 50)
+        return get_invoice_list(db, shop_id, None, None, None, page["next_cursor"], 50)
+
+    def latest_invoice_items(db):
+        invoice = db.query(Invoice).filter(Invoice.shop_id == shop_id).order_by(Invoice.created_at.desc()).first()
+        return invoice_items_query(db, invoice).all()
+
+    return {
+        "last_7_days": last_7_days,
+        "paid_last_30_days": paid_last_30_days,
+        "second_page": second_page,
+        "latest_invoice_items": latest_invoice_items,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InvoiceHub partitioning benchmark")
+    parser.add_argument("--rows", type=int, default=50_000_000, help="historical invoices to load")
+    parser.add_argument("--months", type=int, default=60, help="history span")
+    parser.add_argument("--iterations", type=int, default=50, help="runs per scenario")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    bootstrap()
+
+    db = SessionLocal()
+    try:
+        shop_id, product_id, user_id = history_fixtures(db)
+    finally:
+        db.close()
+
+    loaded = load_history(shop_id, product_id, user_id, args.rows, args.months)
+
+    samples = []
+    started = time.perf_counter()
+    for name, scenario in scenarios(shop_id).items():
+        for _ in range(args.iterations):
+            db = SessionLocal()
+            try:
+                begun = time.perf_counter()
+                scenario(db)
+                samples.append((name, time.perf_counter() - begun, 200, None))
+            finally:
+                db.close()
+    elapsed = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        partitioned = is_partitioned(conn, "invoices")
+
+    by_scenario = {}
+    for sample in samples:
+        by_scenario.setdefault(sample[0], []).append(sample)
+
+    result = {
+        "meta": {
+            "git_commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "partitioned": partitioned,
+            "history_rows": loaded,
+            "history_months": args.months,
+            "iterations": args.iterations,
+        },
+        "overall": summarise(samples, elapsed),
+        "scenarios": {
+            name: summarise(scenario_samples, elapsed)
+            for name, scenario_samples in by_scenario.items()
+        },
+    }
+
+    output = json.dumps(result, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/pdf_export.py
+#
+# Batch PDF export: stream a ZIP of --invoices invoices through the same
+# generator the export download route uses, and record throughput,
+# time to first byte and peak RSS of the web process and of the render
+# workers.
+#
+#   python -m benchmarks.pdf_export --invoices 10000 --output export.json
+#
+# Invoices are created in the "bench-shop-0" tenant through the bulk
+# service; runs reuse the newest --invoices ones and only top up the rest.
+
+import argparse
+import json
+import resource
+import time
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.invoice import Invoice
+from app.services import pdf_export_service
+from benchmarks.run import git_commit
+from benchmarks.seed import seed, seed_invoices
+
+
+def existing_invoice_ids(shop_id: int, limit: int) -> list[int]:
+    db = SessionLocal()
+    try:
+        return [
+            row.id
+            for row in db.query(Invoice.id)
+            .filter(Invoice.shop_id == shop_id)
+            .order_by(Invoice.id.desc())
+            .limit(limit)
+        ]
+    finally:
+        db.close()
+
+
+def peak_rss_mb(who: int) -> float:
+    # ru_maxrss is in KiB on Linux
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InvoiceHub batch PDF export benchmark")
+    parser.add_argument("--invoices", type=int, default=10_000, help="invoices in the export")
+    parser.add_argument("--items", type=int, default=5, help="line items per seeded invoice")
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    args = parser.parse_args()
+
+    tenant = seed(shops=1, products_per_shop=max(args.items, 50))[0]
+    invoice_ids = existing_invoice_ids(tenant["shop_id"], args.invoices)
+    if len(invoice_ids) < args.invoices:
+        invoice_ids += seed_invoices(tenant, args.invoices - len(invoice_ids), args.items)
+    invoice_ids.sort()
+
+    export_id = pdf_export_service.start_export(invoice_ids, tenant["shop_id"], tenant["user_id"])
+    zip_bytes = 0
+    first_byte = None
+
+    started = time.perf_counter()
+    for chunk in pdf_export_service.stream_invoice_zip(export_id, invoice_ids):
+        if chunk and first_byte is None:
+            first_byte = time.perf_counter() - started
+        zip_bytes += len(chunk)
+    elapsed = time.perf_counter() - started
+
+    # Children only show up in RUSAGE_CHILDREN once they have exited
+    pdf_export_service.shutdown()
+    job = pdf_export_service.export_jobs[export_id]
+
+    result = {
+        "meta": {
+            "git_commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "invoices": len(invoice_ids),
+            "items_per_invoice": args.items,
+            "workers": settings.PDF_EXPORT_WORKERS or None,
+        },
+        "status": job["status"],
+        "rendered": job["done"],
+        "elapsed_s": round(elapsed, 2),
+        "first_byte_ms": round((first_byte or 0) * 1000, 2),
+        "invoices_per_s": round(job["done"] / elapsed, 1) if elapsed else 0.0,
+        "zip_mb": round(zip_bytes / (1024 * 1024), 1),
+        "peak_rss_mb": peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_worker_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+    output = json.dumps(result, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# benchmarks/pdf_render.py
+#
+# Single-invoice render time and peak memory as the line count grows,
+# through the same path as GET /invoices/{id}/pdf: the header query,
+# the line count and items streamed from the database by
+# iter_invoice_items. Each size renders in a fresh interpreter so peak
+# RSS is not inherited from a larger run.
+#
+#   python -m benchmarks.pdf_render --lines 10 100 1000 10000 50000 --output render.json
+#
+# Needs the database the app is configured for. One invoice per line
+# count is seeded into the first benchmark shop and reused by later runs.
+
+import argparse
+import json
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from app.api.dependencies import load_principal
+from app.db.database import SessionLocal
+from app.models.invoice import Invoice
+from app.models.user import User
+from app.schemas.invoice_schema import InvoiceCreate, InvoiceItemCreate
+from app.services.invoice_service import create_invoices_bulk_service
+from benchmarks.run import git_commit, percentile
+from benchmarks.seed import seed
+
+RENDER_SNIPPET = """
+import json, resource, sys, time
+import reportlab.pdfgen.canvas  # loaded lazily by the renderer; keep it out of the growth figure
+from sqlalchemy import func
+from app import models  # noqa: F401 - configure every mapper
+from app.db.database import SessionLocal
+from app.models.invoice import Invoice, InvoiceItem
+from app.services.loading import INVOICE_PDF_HEADER
+from app.services.pdf_service import generate_invoice_pdf, invoice_items_query, iter_invoice_items
+
+invoice_id, runs = int(sys.argv[1]), int(sys.argv[2])
+
+baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+samples = []
+for _ in range(runs):
+    # a session per render, as per request
+    db = SessionLocal()
+    started = time.perf_counter()
+    invoice = db.query(Invoice).options(*INVOICE_PDF_HEADER).filter(Invoice.id == invoice_id).one()
+    lines = invoice_items_query(db, invoice).with_entities(func.count(InvoiceItem.id)).scalar()
+    with generate_invoice_pdf(invoice, iter_invoice_items(db, invoice), lines) as buffer:
+        size = len(buffer.read())
+    samples.append((time.perf_counter() - started) * 1000)
+    db.close()
+
+json.dump({
+    "samples_ms": samples,
+    "pdf_bytes": size,
+    "baseline_rss_kb": baseline_kb,
+    "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}, sys.stdout)
+"""
+
+
+def seed_invoice(tenant: dict, lines: int) -> int:
+    """The id of the tenant's `lines`-line render invoice, created on first use."""
+    customer_name = f"Render {lines} lines"
+    product_ids = tenant["product_ids"]
+
+    db = SessionLocal()
+    try:
+        invoice_id = db.query(Invoice.id).filter(
+            Invoice.shop_id == tenant["shop_id"], Invoice.customer_name == customer_name
+        ).scalar()
+        if invoice_id:
+            return invoice_id
+
+        user_id = db.query(User.id).filter(User.email == tenant["email"]).scalar()
+        row = InvoiceCreate(
+            customer_name=customer_name,
+            items=[
+                InvoiceItemCreate(product_id=product_ids[n % len(product_ids)], quantity=1)
+                for n in range(lines)
+            ]
+        )
+        [result] = create_invoices_bulk_service(db, [row], load_principal(db, user_id))
+        return result["invoice_id"]
+    finally:
+        db.close()
+
+
+def render(invoice_id: int, lines: int, runs: int) -> dict:
+    output = subprocess.check_output([sys.executable, "-c", RENDER_SNIPPET, str(invoice_id), str(runs)], text=True)
+    sample = json.loads(output.strip().splitlines()[-1])
+    values = sorted(sample["samples_ms"])
+
+    return {
+        "lines": lines,
+        "p50_ms": round(percentile(values, 50), 2),
+        "max_ms": round(values[-1], 2),
+        "ms_per_1k_lines": round(percentile(values, 50) / lines * 1000, 2),
+        "pdf_kb": round(sample["pdf_bytes"] / 1024, 1),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(sample["peak_rss_kb"] / 1024, 1),
+        "render_rss_growth_mb": round((sample["peak_rss_kb"] - sample["baseline_rss_kb"]) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InvoiceHub PDF render benchmark")
+    parser.add_argument("--lines", type=int, nargs="+", default=[10, 100, 1_000, 10_000, 50_000],
+                        help="line counts to render")
+    parser.add_argument("--runs", type=int, default=3, help="renders per line count")
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    args = parser.parse_args()
+
+    [tenant] = seed(shops=1)
+
+    result = {
+        "meta": {
+            "git_commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "runs": args.runs,
+        },
+        "sizes": [render(seed_invoice(tenant, lines), lines, args.runs) for lines in args.lines],
+    }
+
+    output = json.dumps(result, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
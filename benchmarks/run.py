@@ -0,0 +1,178 @@
+# benchmarks/run.py
+#
+# Load/benchmark harness for the core API flows.
+#
+#   # in-process (ASGI transport, no server needed)
+#   python -m benchmarks.run --duration 30 --concurrency 50 --output before.json
+#
+#   # against a running deployment
+#   python -m benchmarks.run --base-url http://localhost:8000 --concurrency 500
+#
+# Both modes seed through the configured database (Postgres; the schema
+# uses Postgres-only features such as ON CONFLICT and FILTER).
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarise(samples: list[tuple], duration: float) -> dict:
+    latencies = sorted(latency for _, latency, _, _ in samples)
+    queries = [count for _, _, _, count in samples if count is not None]
+    errors = sum(1 for _, _, status, _ in samples if status >= 400)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": round(len(samples) / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def worker(client, tenants, mix, deadline, samples):
+    names = list(mix)
+    weights = [mix[name][1] for name in names]
+
+    while time.perf_counter() < deadline:
+        name = random.choices(names, weights)[0]
+        scenario = mix[name][0]
+        tenant = random.choice(tenants)
+
+        started = time.perf_counter()
+        try:
+            response = await scenario(client, tenant)
+            status = response.status_code
+            query_count = response.headers.get("x-db-query-count")
+        except Exception:
+            status, query_count = 599, None
+        samples.append((name, time.perf_counter() - started, status, int(query_count) if query_count else None))
+
+
+async def authenticate(client, tenants):
+    for tenant in tenants:
+        response = await client.post(
+            "/auth/login",
+            params={"email": tenant["email"], "password": tenant["password"]}
+        )
+        response.raise_for_status()
+        tenant["headers"] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        tenant["invoice_ids"] = []
+
+
+async def run(args) -> dict:
+    try:
+        import httpx
+    except ImportError:
+        sys.exit("The benchmark harness needs httpx: pip install httpx")
+
+    from benchmarks.scenarios import MIXES
+    from benchmarks.seed import seed
+
+    mix = MIXES[args.mix]
+    tenants = seed(args.shops, args.products)
+
+    app = None
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60)
+    else:
+        from app.main import app
+        # ASGITransport sends no lifespan events; run the handlers as uvicorn would
+        await app.router.startup()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+    samples = []
+    try:
+        async with client:
+            await authenticate(client, tenants)
+
+            # warm up caches and pools so runs are comparable
+            warmup_deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(worker(client, tenants, mix, warmup_deadline, []) for _ in range(args.concurrency)))
+
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(worker(client, tenants, mix, deadline, samples) for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+    finally:
+        if app is not None:
+            await app.router.shutdown()
+
+    by_scenario = {}
+    for sample in samples:
+        by_scenario.setdefault(sample[0], []).append(sample)
+
+    scenarios = {name: summarise(rows, elapsed) for name, rows in sorted(by_scenario.items())}
+    for name, summary in scenarios.items():
+        rows_per_request = getattr(mix[name][0], "rows", None)
+        if rows_per_request:
+            succeeded = sum(1 for _, _, status, _ in by_scenario[name] if status < 400)
+            summary["rows_per_s"] = round(succeeded * rows_per_request / elapsed, 2) if elapsed else 0.0
+
+    return {
+        "meta": {
+            "git_commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "mode": "external" if args.base_url else "in-process",
+            "base_url": args.base_url,
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 2),
+            "shops": args.shops,
+            "products_per_shop": args.products,
+        },
+        "overall": summarise(samples, elapsed),
+        "scenarios": scenarios,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InvoiceHub load/benchmark harness")
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--mix", default="default", help="scenario mix (see benchmarks/scenarios.py)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    parser.add_argument("--shops", type=int, default=3)
+    parser.add_argument("--products", type=int, default=500, help="products per shop")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    # per-request query counts come from the X-DB-Query-Count header
+    os.environ.setdefault("QUERY_DEBUG", "true")
+
+    result = asyncio.run(run(args))
+    output = json.dumps(result, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/scenarios.py
+#
+# Request flows driven by the harness. Each scenario takes an httpx
+# AsyncClient and a tenant dict (see seed.py) and returns the response.
+# Scenarios that write invoices set `rows` (invoices per request) so the
+# harness can report rows/s alongside requests/s.
+
+import random
+
+BASKET_SIZES = (1, 3, 10, 50, 200)
+BULK_ROWS = 500
+BULK_BASKET_SIZES = (1, 3, 10)
+
+
+async def login(client, tenant):
+    return await client.post(
+        "/auth/login",
+        params={"email": tenant["email"], "password": tenant["password"]}
+    )
+
+
+async def list_products(client, tenant):
+    return await client.get("/products/", params={"limit": 50}, headers=tenant["headers"])
+
+
+async def search_products(client, tenant):
+    # type-ahead prefixes, plus the odd typo for the fuzzy path
+    number = random.randint(1, 99)
+    q = random.choice([f"Product {number}", "prod", f"Prodcut {number}"])
+    return await client.get("/products/search", params={"q": q, "in_stock": "true"}, headers=tenant["headers"])
+
+
+async def create_invoice(client, tenant):
+    basket_size = random.choice(BASKET_SIZES)
+    items = [
+        {"product_id": product_id, "quantity": random.randint(1, 3)}
+        for product_id in random.sample(tenant["product_ids"], min(basket_size, len(tenant["product_ids"])))
+    ]
+    response = await client.post(
+        "/invoices/",
+        json={"customer_name": "Bench Customer", "tax_rate": 5, "items": items},
+        headers=tenant["headers"]
+    )
+    if response.status_code == 200:
+        tenant["invoice_ids"].append(response.json()["id"])
+    return response
+
+create_invoice.rows = 1
+
+
+async def bulk_create_invoices(client, tenant):
+    rows = [
+        {
+            "customer_name": "Bench Customer",
+            "tax_rate": 5,
+            "items": [
+                {"product_id": product_id, "quantity": random.randint(1, 3)}
+                for product_id in random.sample(tenant["product_ids"], min(basket_size, len(tenant["product_ids"])))
+            ],
+        }
+        for basket_size in random.choices(BULK_BASKET_SIZES, k=BULK_ROWS)
+    ]
+    return await client.post("/invoices/bulk", json=rows, headers=tenant["headers"])
+
+bulk_create_invoices.rows = BULK_ROWS
+
+
+async def dashboard(client, tenant):
+    return await client.get("/dashboard/summary", headers=tenant["headers"])
+
+
+async def download_pdf(client, tenant):
+    if not tenant["invoice_ids"]:
+        return await create_invoice(client, tenant)
+    invoice_id = random.choice(tenant["invoice_ids"])
+    return await client.get(f"/invoices/{invoice_id}/pdf", headers=tenant["headers"])
+
+
+# name -> (scenario, weight)
+MIXES = {
+    "default": {
+        "login": (login, 5),
+        "list_products": (list_products, 30),
+        "create_invoice": (create_invoice, 30),
+        "dashboard": (dashboard, 25),
+        "download_pdf": (download_pdf, 10),
+    },
+    "checkout": {
+        "list_products": (list_products, 20),
+        "search_products": (search_products, 30),
+        "create_invoice": (create_invoice, 50),
+    },
+    # cashier type-ahead; run with --products 100000 for the latency target
+    "search": {
+        "search_products": (search_products, 100),
+    },
+    # shift-change login burst alongside checkouts (bcrypt pool isolation)
+    "login_storm": {
+        "login": (login, 50),
+        "create_invoice": (create_invoice, 50),
+    },
+    # imports/offline sync; compare rows_per_s with create_invoice under "checkout"
+    "bulk": {
+        "bulk_create_invoices": (bulk_create_invoices, 100),
+    },
+    "reporting": {
+        "dashboard": (dashboard, 70),
+        "download_pdf": (download_pdf, 30),
+    },
+}
@@ -0,0 +1,105 @@
+# benchmarks/seed.py
+#
+# Seed shops, products and shop admins for the benchmark harness.
+# Idempotent: existing "bench-*" rows are reused.
+
+import random
+
+from app.api.dependencies import load_principal
+from app.core.security import pwd_context
+from app.db.database import SessionLocal
+from app.models.organization import Organization
+from app.models.product import Product
+from app.models.role import Role
+from app.models.user import User
+from app.schemas.invoice_schema import InvoiceCreate, InvoiceItemCreate
+from app.services.invoice_service import create_invoices_bulk_service
+from app.utils.startup import bootstrap
+
+BENCH_PASSWORD = "bench-password"
+
+
+def seed(shops: int = 3, products_per_shop: int = 500, stock: int = 10_000_000) -> list[dict]:
+    """Returns one {"shop_id", "user_id", "email", "password", "product_ids"} per shop."""
+    bootstrap()
+
+    db = SessionLocal()
+    try:
+        shop_admin_role = db.query(Role).filter(Role.name == "shop_admin").one()
+        hashed_password = pwd_context.hash(BENCH_PASSWORD)
+        tenants = []
+
+        for index in range(shops):
+            name = f"bench-shop-{index}"
+            shop = db.query(Organization).filter(Organization.name == name).first()
+            if not shop:
+                shop = Organization(name=name)
+                db.add(shop)
+                db.flush()
+
+            existing = db.query(Product.id).filter(Product.shop_id == shop.id).count()
+            db.add_all(
+                Product(
+                    name=f"Product {n}",
+                    description=f"Benchmark product {n}",
+                    price=round(random.uniform(1, 500), 2),
+                    quantity=stock,
+                    shop_id=shop.id
+                )
+                for n in range(existing, products_per_shop)
+            )
+
+            email = f"bench-admin-{index}@example.com"
+            admin = db.query(User).filter(User.email == email).first()
+            if not admin:
+                admin = User(
+                    username=f"bench-admin-{index}",
+                    email=email,
+                    hashed_password=hashed_password,
+                    organization_id=shop.id
+                )
+                admin.roles.append(shop_admin_role)
+                db.add(admin)
+
+            db.commit()
+
+            product_ids = [row.id for row in db.query(Product.id).filter(Product.shop_id == shop.id)]
+            tenants.append({
+                "shop_id": shop.id,
+                "user_id": admin.id,
+                "email": email,
+                "password": BENCH_PASSWORD,
+                "product_ids": product_ids,
+            })
+
+        return tenants
+    finally:
+        db.close()
+
+
+def seed_invoices(tenant: dict, count: int, items_per_invoice: int = 5, batch_size: int = 1000) -> list[int]:
+    """Create `count` invoices for a seeded tenant through the bulk service; returns their ids."""
+    invoice_ids = []
+
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.email == tenant["email"]).scalar()
+        principal = load_principal(db, user_id)
+
+        for start in range(0, count, batch_size):
+            rows = [
+                InvoiceCreate(
+                    customer_name=f"Customer {n}",
+                    items=[
+                        InvoiceItemCreate(product_id=product_id, quantity=random.randint(1, 5))
+                        for product_id in random.sample(tenant["product_ids"], items_per_invoice)
+                    ]
+                )
+                for n in range(start, min(start + batch_size, count))
+            ]
+            results = create_invoices_bulk_service(db, rows, principal)
+            invoice_ids += [result["invoice_id"] for result in results if result["status"] == "created"]
+
+        return invoice_ids
+    finally:
+        db.close()
@@ -0,0 +1,87 @@
+# benchmarks/startup.py
+#
+# Cold worker boot time: each sample is a fresh interpreter that imports
+# app.main and runs the startup handlers, as a uvicorn/gunicorn worker does.
+#
+#   python -m benchmarks.startup --runs 10 --workers 4 --output startup.json
+#
+# --workers boots that many interpreters at once so contention on the
+# bootstrap advisory lock shows up in the numbers.
+
+import argparse
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from benchmarks.run import git_commit, percentile
+
+BOOT_SNIPPET = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+asyncio.run(app.router.startup())
+booted = time.perf_counter()
+# flushes the log queue, so the result below is the last line on stdout
+asyncio.run(app.router.shutdown())
+json.dump({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (booted - imported) * 1000,
+    "total_ms": (booted - started) * 1000,
+    "reportlab_loaded": "reportlab" in sys.modules,
+}, sys.stdout)
+"""
+
+
+def boot_once() -> dict:
+    output = subprocess.check_output([sys.executable, "-c", BOOT_SNIPPET], text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarise(samples: list[dict], key: str) -> dict:
+    values = sorted(sample[key] for sample in samples)
+    return {
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "max_ms": round(values[-1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InvoiceHub cold-boot benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="boot rounds")
+    parser.add_argument("--workers", type=int, default=1, help="interpreters booted concurrently per round")
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    args = parser.parse_args()
+
+    samples = []
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for _ in range(args.runs):
+            samples.extend(pool.map(lambda _: boot_once(), range(args.workers)))
+
+    result = {
+        "meta": {
+            "git_commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "runs": args.runs,
+            "workers": args.workers,
+        },
+        "import": summarise(samples, "import_ms"),
+        "startup": summarise(samples, "startup_ms"),
+        "total": summarise(samples, "total_ms"),
+        "reportlab_loaded_at_boot": any(sample["reportlab_loaded"] for sample in samples),
+    }
+
+    output = json.dumps(result, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
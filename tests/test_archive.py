@@ -0,0 +1,146 @@
+import gzip
+import hashlib
+import json
+from datetime import datetime
+
+import pytest
+
+ARCHIVED_AT = datetime(2010, 1, 15, 12, 0)
+OLDER_THAN_DAYS = 3650
+
+
+@pytest.fixture
+def archived(engine, db, make_shop):
+    """A shop whose three (backdated, paid) invoices have been archived."""
+    from sqlalchemy import text
+
+    from app.db.partitioning import is_partitioned
+    from app.models.invoice import Invoice
+    from app.schemas.invoice_schema import InvoiceCreate
+    from app.services.archive_service import archive_invoices, invoice_record
+    from app.services.invoice_service import create_invoices_bulk_service
+    from app.services.loading import INVOICE_PDF
+
+    with engine.connect() as conn:
+        if is_partitioned(conn, "invoices"):
+            pytest.skip("no partitions exist for the backdated month")
+
+    shop = make_shop()
+    rows = [
+        InvoiceCreate(
+            customer_name=f"Archived customer {n}",
+            payment_status="paid",
+            items=[{"product_id": product_id, "quantity": n + 1} for product_id in shop.product_ids[:2]]
+        )
+        for n in range(3)
+    ]
+    invoice_ids = [result["invoice_id"] for result in create_invoices_bulk_service(db, rows, shop.admin)]
+
+    db.execute(
+        text("UPDATE invoices SET created_at = :at WHERE id = ANY(:ids)"),
+        {"at": ARCHIVED_AT, "ids": invoice_ids}
+    )
+    db.execute(
+        text("UPDATE invoice_items SET invoice_created_at = :at WHERE invoice_id = ANY(:ids)"),
+        {"at": ARCHIVED_AT, "ids": invoice_ids}
+    )
+    db.commit()
+
+    originals = {
+        invoice.id: invoice_record(invoice)
+        for invoice in db.query(Invoice).options(*INVOICE_PDF).filter(Invoice.id.in_(invoice_ids))
+    }
+    db.expunge_all()
+
+    archive_invoices(db, older_than_days=OLDER_THAN_DAYS)
+    shop.invoice_ids = invoice_ids
+    shop.originals = originals
+    return shop
+
+
+def test_archive_moves_invoices_out_of_the_hot_tables(archived, db):
+    from app.models.invoice import Invoice, InvoiceItem
+    from app.models.invoice_archive import ArchivedInvoice
+
+    assert db.query(Invoice).filter(Invoice.id.in_(archived.invoice_ids)).count() == 0
+    assert db.query(InvoiceItem).filter(InvoiceItem.invoice_id.in_(archived.invoice_ids)).count() == 0
+
+    index_rows = db.query(ArchivedInvoice).filter(ArchivedInvoice.id.in_(archived.invoice_ids)).all()
+    assert sorted(row.id for row in index_rows) == sorted(archived.invoice_ids)
+    assert all(row.shop_id == archived.id and row.payment_status == "paid" for row in index_rows)
+
+
+def test_archived_invoices_read_back_unchanged(archived, db):
+    from app.services.archive_service import load_archived_invoices, verify_archive
+
+    assert verify_archive(db) >= len(archived.invoice_ids)
+
+    snapshots = {snapshot.id: snapshot for snapshot in load_archived_invoices(db, archived.invoice_ids)}
+    assert sorted(snapshots) == sorted(archived.invoice_ids)
+
+    for invoice_id, original in archived.originals.items():
+        snapshot = snapshots[invoice_id]
+        assert snapshot.invoice_number == original["invoice_number"]
+        assert snapshot.created_at == ARCHIVED_AT
+        assert snapshot.grand_total == original["grand_total"]
+        assert [(item.id, item.quantity, item.total_price) for item in snapshot.items] == [
+            (item["id"], item["quantity"], item["total_price"]) for item in original["items"]
+        ]
+
+
+def test_tampered_segment_is_detected(archived, db):
+    from app.models.invoice_archive import ArchivedInvoice, InvoiceArchiveSegment
+    from app.services.archive_service import ArchiveIntegrityError, load_archived_invoice
+
+    invoice_id = archived.invoice_ids[0]
+    segment_id = db.get(ArchivedInvoice, invoice_id).segment_id
+    payload, checksum = db.query(InvoiceArchiveSegment.payload, InvoiceArchiveSegment.checksum).filter(
+        InvoiceArchiveSegment.id == segment_id
+    ).one()
+
+    def store(new_payload, new_checksum):
+        db.query(InvoiceArchiveSegment).filter(InvoiceArchiveSegment.id == segment_id).update(
+            {"payload": new_payload, "checksum": new_checksum}, synchronize_session=False
+        )
+        db.commit()
+        db.expunge_all()
+
+    try:
+        # Corrupt payload: the segment checksum catches it
+        store(payload[:-1] + bytes([payload[-1] ^ 0xFF]), checksum)
+        with pytest.raises(ArchiveIntegrityError):
+            load_archived_invoice(db, invoice_id)
+
+        # Rewritten record with a matching segment checksum: the per-record checksum catches it
+        records = [json.loads(line) for line in gzip.decompress(payload).splitlines()]
+        for record in records:
+            if record["id"] == invoice_id:
+                record["grand_total"] += 1
+        forged = gzip.compress(b"\n".join(json.dumps(record).encode() for record in records))
+        store(forged, hashlib.sha256(forged).hexdigest())
+        with pytest.raises(ArchiveIntegrityError):
+            load_archived_invoice(db, invoice_id)
+    finally:
+        store(payload, checksum)
+
+    assert load_archived_invoice(db, invoice_id).id == invoice_id
+
+
+def test_archived_invoice_pdf_download(archived, api):
+    pytest.importorskip("reportlab")
+
+    response = api(archived.admin, "GET", f"/invoices/{archived.invoice_ids[0]}/pdf")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+
+
+def test_export_includes_archived_invoices(archived, api):
+    response = api(archived.admin, "GET", "/invoices/export", params={"kind": "invoices", "format": "ndjson"})
+
+    assert response.status_code == 200
+    exported = {row["id"]: row for row in map(json.loads, response.text.splitlines())}
+    for invoice_id, original in archived.originals.items():
+        assert exported[invoice_id]["invoice_number"] == original["invoice_number"]
+        assert exported[invoice_id]["grand_total"] == original["grand_total"]
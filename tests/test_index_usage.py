@@ -0,0 +1,153 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+# (description, query runner, indexes any of which satisfies the plan,
+#  whether the plan must return rows in index order, i.e. without a Sort)
+CASES = [
+    (
+        "shop invoice list",
+        lambda db, shop: list_invoices(db, shop.id),
+        {"ix_invoices_shop_created"},
+        True,
+    ),
+    (
+        "shop dashboard list by status and date",
+        lambda db, shop: dashboard_list(db, shop.id, "paid", datetime.utcnow().date() - timedelta(days=30)),
+        {"ix_invoices_shop_status_created", "ix_invoices_shop_created"},
+        False,
+    ),
+    (
+        "cross-shop invoice list",
+        lambda db, shop: list_invoices(db, None),
+        {"ix_invoices_created"},
+        True,
+    ),
+    (
+        "shop product list",
+        lambda db, shop: list_products(db, shop.id),
+        {"ix_products_shop_created"},
+        True,
+    ),
+    (
+        "shop dashboard summary",
+        lambda db, shop: dashboard_summary(db, shop.id),
+        {"daily_revenue_pkey"},
+        False,
+    ),
+    (
+        "shop daily revenue chart",
+        lambda db, shop: daily_chart(db, shop.id),
+        {"daily_revenue_pkey"},
+        False,
+    ),
+]
+
+
+def list_invoices(db, shop_id):
+    from app.api.invoice import _list_invoices
+    return _list_invoices(db, shop_id, None, 20, False)
+
+
+def dashboard_list(db, shop_id, status, date_from):
+    from app.services.dashboard_service import get_invoice_list
+    return get_invoice_list(db, shop_id, status, date_from, None, None, 20)
+
+
+def list_products(db, shop_id):
+    from app.api.product import _list_products
+    return _list_products(db, shop_id, None, 20, False)
+
+
+def dashboard_summary(db, shop_id):
+    from app.services.dashboard_service import get_dashboard_summary
+    return get_dashboard_summary.compute(db, shop_id)  # bypass the dashboard cache
+
+
+def daily_chart(db, shop_id):
+    from app.services.dashboard_service import get_daily_revenue_chart
+    return get_daily_revenue_chart.compute(db, shop_id, 7)
+
+
+@contextmanager
+def captured_statements(engine):
+    from sqlalchemy import event
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def plan(engine, statement, parameters) -> str:
+    from sqlalchemy import text
+
+    with engine.begin() as conn:
+        # Test tables are small; rule out sequential and bitmap scans so
+        # the plan shows which index serves the query (a bitmap scan can't
+        # return rows in index order, so it would always need a Sort)
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        conn.execute(text("SET LOCAL enable_bitmapscan = off"))
+        rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        return "\n".join(row[0] for row in rows)
+
+
+@pytest.fixture
+def shop(engine, db, make_shop):
+    from sqlalchemy import text
+
+    from app.db.partitioning import is_partitioned
+    from app.schemas.invoice_schema import InvoiceCreate
+    from app.services.invoice_service import create_invoices_bulk_service
+
+    with engine.connect() as conn:
+        if is_partitioned(conn, "invoices"):
+            pytest.skip("partition indexes carry per-partition names")
+
+    # Enough rows that the statistics are real, not the empty-table defaults
+    shop = make_shop(products=200)
+    rows = [
+        InvoiceCreate(customer_name="Indexed customer", items=[{"product_id": product_id, "quantity": 1}])
+        for product_id in shop.product_ids
+    ]
+    create_invoices_bulk_service(db, rows, shop.admin)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ("products", "invoices", "invoice_items", "daily_revenue"):
+            conn.execute(text(f"ANALYZE {table}"))
+    return shop
+
+
+@pytest.mark.parametrize("description, run, indexes, ordered", CASES, ids=[case[0] for case in CASES])
+def test_listing_queries_use_composite_indexes(description, run, indexes, ordered, engine, db, shop):
+    with captured_statements(engine) as statements:
+        run(db, shop)
+    db.rollback()
+
+    query = statements[0]
+    explained = plan(engine, *query)
+    context = f"{description}:\n{query[0]}\n{explained}"
+
+    assert any(index in explained for index in indexes), context
+    if ordered:
+        # keyset pages come straight off the index, newest first
+        assert "Sort" not in explained, context
+
+
+def test_invoice_items_load_uses_invoice_id_index(engine, db, shop):
+    with captured_statements(engine) as statements:
+        list_invoices(db, shop.id)
+    db.rollback()
+
+    items_query = next(
+        (statement, parameters) for statement, parameters in statements if "FROM invoice_items" in statement
+    )
+    explained = plan(engine, *items_query)
+    assert "ix_invoice_items_invoice_id" in explained, explained
@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+PARALLEL_CREATES = 200
+
+
+def create_invoice(shop) -> str:
+    from app.db.database import SessionLocal
+    from app.schemas.invoice_schema import InvoiceCreate
+    from app.services.invoice_service import create_invoice_service
+
+    invoice_data = InvoiceCreate(
+        customer_name="Parallel customer",
+        items=[{"product_id": shop.product_ids[0], "quantity": 1}]
+    )
+    db = SessionLocal()
+    try:
+        return create_invoice_service(db, invoice_data, shop.admin).invoice_number
+    finally:
+        db.close()
+
+
+def test_parallel_creates_get_distinct_numbers(make_shop):
+    from app.core.config import settings
+
+    shop = make_shop()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        numbers = list(pool.map(lambda _: create_invoice(shop), range(PARALLEL_CREATES)))
+
+    assert len(set(numbers)) == PARALLEL_CREATES
+
+    if settings.INVOICE_NUMBER_BLOCK_SIZE <= 1:
+        year = datetime.utcnow().year
+        assert sorted(numbers) == [f"INV-{year}-{seq:06d}" for seq in range(1, PARALLEL_CREATES + 1)]
+
+
+def test_every_shop_starts_its_own_sequence(make_shop):
+    first, second = make_shop(), make_shop()
+
+    year = datetime.utcnow().year
+    assert create_invoice(first) == f"INV-{year}-000001"
+    assert create_invoice(second) == f"INV-{year}-000001"
+    assert create_invoice(second) == f"INV-{year}-000002"
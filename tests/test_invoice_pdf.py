@@ -0,0 +1,103 @@
+import pytest
+
+
+@pytest.fixture
+def invoice(db, make_shop):
+    """A live invoice with more lines than one item chunk."""
+    from app.schemas.invoice_schema import InvoiceCreate
+    from app.services.invoice_service import create_invoices_bulk_service
+    from app.services.pdf_service import ITEM_CHUNK_SIZE
+
+    shop = make_shop()
+    lines = ITEM_CHUNK_SIZE + 1
+    row = InvoiceCreate(
+        customer_name="PDF customer",
+        items=[
+            {"product_id": shop.product_ids[n % len(shop.product_ids)], "quantity": 1}
+            for n in range(lines)
+        ]
+    )
+    [result] = create_invoices_bulk_service(db, [row], shop.admin)
+    assert result["status"] == "created"
+
+    shop.invoice_id = result["invoice_id"]
+    shop.lines = lines
+    return shop
+
+
+def test_items_stream_in_line_order_with_products(invoice, db):
+    from app.models.invoice import Invoice
+    from app.services.pdf_service import iter_invoice_items
+
+    header = db.get(Invoice, invoice.invoice_id)
+    items = list(iter_invoice_items(db, header))
+
+    assert len(items) == invoice.lines
+    assert [item.id for item in items] == sorted(item.id for item in items)
+    assert [item.product.id for item in items] == [
+        invoice.product_ids[n % len(invoice.product_ids)] for n in range(invoice.lines)
+    ]
+
+
+def test_invoice_pdf_download(invoice, api):
+    pytest.importorskip("reportlab")
+
+    response = api(invoice.admin, "GET", f"/invoices/{invoice.invoice_id}/pdf")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+    assert int(response.headers["content-length"]) == len(response.content)
+
+    url = f"/invoices/{invoice.invoice_id}/pdf"
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    for headers in ({"If-None-Match": etag}, {"If-Modified-Since": last_modified}):
+        cached = api(invoice.admin, "GET", url, headers=headers)
+        assert cached.status_code == 304, headers
+        assert cached.headers["etag"] == etag
+
+    # If-None-Match decides when both are sent
+    stale = api(invoice.admin, "GET", url, headers={"If-None-Match": '"stale"', "If-Modified-Since": last_modified})
+    assert stale.status_code == 200
+
+
+def test_product_rename_changes_the_pdf_version(invoice, api):
+    pytest.importorskip("reportlab")
+
+    url = f"/invoices/{invoice.invoice_id}/pdf"
+    etag = api(invoice.admin, "GET", url).headers["etag"]
+
+    # price and stock changes aren't printed on past invoices
+    api(invoice.admin, "PUT", f"/products/{invoice.product_ids[0]}", json={"quantity": 5})
+    assert api(invoice.admin, "GET", url, headers={"If-None-Match": etag}).status_code == 304
+
+    renamed = api(invoice.admin, "PUT", f"/products/{invoice.product_ids[0]}", json={"name": "Renamed product"})
+    assert renamed.status_code == 200
+
+    response = api(invoice.admin, "GET", url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_invoice_pdf_is_scoped_to_the_shop(invoice, make_shop, api):
+    other = make_shop()
+
+    response = api(other.admin, "GET", f"/invoices/{invoice.invoice_id}/pdf")
+
+    assert response.status_code == 403
+
+
+def test_export_status_is_scoped_to_the_shop(invoice, make_shop, api):
+    from app.services.pdf_export_service import export_jobs, start_export
+
+    export_id = start_export([invoice.invoice_id], invoice.id, invoice.admin.id)
+    try:
+        own = api(invoice.admin, "GET", f"/invoices/export/pdf/{export_id}")
+        assert own.status_code == 200
+        assert own.json()["total"] == 1
+
+        other = make_shop()
+        assert api(other.admin, "GET", f"/invoices/export/pdf/{export_id}").status_code == 404
+    finally:
+        export_jobs.pop(export_id, None)
@@ -0,0 +1,47 @@
+import pytest
+
+# One query for the page of invoices, one SELECT ... IN for all their items
+LIST_QUERIES = 2
+INVOICE_COUNTS = (1, 10, 50)
+
+
+def create_invoices(db, shop, count: int):
+    from app.schemas.invoice_schema import InvoiceCreate
+    from app.services.invoice_service import create_invoices_bulk_service
+
+    rows = [
+        InvoiceCreate(
+            customer_name=f"Customer {n}",
+            items=[{"product_id": product_id, "quantity": 1} for product_id in shop.product_ids[:3]]
+        )
+        for n in range(count)
+    ]
+    results = create_invoices_bulk_service(db, rows, shop.admin)
+    assert all(result["status"] == "created" for result in results)
+
+
+@pytest.mark.parametrize("url", ["/invoices/", "/dashboard/invoices"])
+def test_invoice_lists_use_a_fixed_number_of_queries(url, db, make_shop, api):
+    from app.core.query_debug import assert_max_queries
+
+    shop = make_shop()
+    params = {"limit": 100}
+    counts = {}
+    created = 0
+
+    for count in INVOICE_COUNTS:
+        create_invoices(db, shop, count - created)
+        created = count
+
+        # first request may open a connection and introspect types
+        api(shop.admin, "GET", url, params=params)
+
+        with assert_max_queries(LIST_QUERIES) as statements:
+            response = api(shop.admin, "GET", url, params=params)
+
+        assert response.status_code == 200
+        assert len(response.json()["data"]) == count
+        assert all(len(invoice["items"]) == 3 for invoice in response.json()["data"])
+        counts[count] = len(statements)
+
+    assert len(set(counts.values())) == 1, f"query count grows with invoices: {counts}"
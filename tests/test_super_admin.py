@@ -0,0 +1,77 @@
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def credentials(db):
+    """Unique super admin credentials; the accounts made with them are removed afterwards."""
+    from app.models.association import user_roles
+    from app.models.user import User
+
+    suffix = uuid.uuid4().hex[:10]
+    credentials = {
+        "username": f"test-super-{suffix}",
+        "email": f"test-super-{suffix}@example.com",
+        "password": "test-password",
+    }
+    yield credentials
+
+    db.rollback()
+    user_ids = [
+        row.id for row in db.query(User.id).filter(
+            (User.username == credentials["username"]) | (User.email == credentials["email"])
+        )
+    ]
+    db.execute(user_roles.delete().where(user_roles.c.user_id.in_(user_ids)))
+    db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+    db.commit()
+
+
+def role_names(db, user_id) -> set[str]:
+    from app.models.association import user_roles
+    from app.models.role import Role
+
+    return {
+        row.name
+        for row in db.query(Role.name).join(user_roles, user_roles.c.role_id == Role.id)
+        .filter(user_roles.c.user_id == user_id)
+    }
+
+
+def test_rerun_restores_a_missing_role_link(db, credentials):
+    from app.models.association import user_roles
+    from app.utils.init_super_admin import create_super_admin
+
+    user = create_super_admin(db, **credentials)
+    assert role_names(db, user.id) == {"super_admin"}
+
+    db.execute(user_roles.delete().where(user_roles.c.user_id == user.id))
+    db.commit()
+
+    again = create_super_admin(db, **credentials)
+    assert again.id == user.id
+    assert role_names(db, user.id) == {"super_admin"}
+
+
+def test_taken_username_is_not_promoted(db, make_shop, credentials):
+    from app.models.user import User
+    from app.utils.init_super_admin import create_super_admin
+
+    shop = make_shop()
+    db.query(User).filter(User.id == shop.admin.id).update({"username": credentials["username"]})
+    db.commit()
+
+    assert create_super_admin(db, **credentials) is None
+    assert role_names(db, shop.admin.id) == {"shop_admin"}
+    assert db.query(User).filter(User.email == credentials["email"]).count() == 0
+
+
+def test_existing_super_admin_under_another_email_is_reused(db, credentials):
+    from app.utils.init_super_admin import create_super_admin
+
+    user = create_super_admin(db, **credentials)
+
+    moved = create_super_admin(db, credentials["username"], f"moved-{credentials['email']}", credentials["password"])
+    assert moved.id == user.id
+    assert role_names(db, user.id) == {"super_admin"}